@@ -13,6 +13,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import List, Tuple, Optional
+from math import fsum
+from operator import truediv, mul
+from itertools import repeat
+from multiprocessing import Pool
+from decimal import Decimal, Context
 
 
 def calculate_pi(n_terms: int) -> float:
@@ -27,5 +33,64 @@ def calculate_pi(n_terms: int) -> float:
     return pi
 
 
+# The sum of terms start (which must be even) up to, but not including,
+# stop of the series above. Each positive term and the negative one after
+# it are added up front, 4/(4k + 1) - 4/(4k + 3) = 8/((4k + 1)(4k + 3)),
+# so there is half as much to sum and nothing cancels out. The pairs are
+# summed in one map() over ranges, which runs in C instead of a Python loop.
+def _leibniz_block(start: int, stop: int) -> float:
+    pairs_stop: int = stop - (stop - start) % 2
+    total: float = fsum(map(truediv, repeat(8.0), map(mul, range(2 * start + 1, 2 * pairs_stop + 1, 4),
+                                                         range(2 * start + 3, 2 * pairs_stop + 3, 4))))
+    if pairs_stop < stop:  # an odd number of terms leaves one positive term over
+        total += 4.0 / (2 * pairs_stop + 1)
+    return total
+
+
+# The same series summed block_size terms at a time
+def calculate_pi_blocks(n_terms: int, block_size: int = 1 << 16) -> float:
+    block_size += block_size % 2  # blocks have to start on positive terms
+    return fsum(_leibniz_block(start, min(start + block_size, n_terms)) for start in range(0, n_terms, block_size))
+
+
+# The same series with its blocks spread over a pool of processes
+# (processes=None uses one per CPU)
+def calculate_pi_parallel(n_terms: int, processes: Optional[int] = None, block_size: int = 1 << 20) -> float:
+    block_size += block_size % 2  # blocks have to start on positive terms
+    blocks: List[Tuple[int, int]] = [(start, min(start + block_size, n_terms)) for start in range(0, n_terms, block_size)]
+    with Pool(processes) as pool:
+        return fsum(pool.starmap(_leibniz_block, blocks))
+
+
+# arctan(1 / x) times unity, summed with integers only:
+#   arctan(1 / x) = 1/x - 1/(3x^3) + 1/(5x^5) - ...
+def _arctan_inverse(x: int, unity: int) -> int:
+    total: int = unity // x
+    power: int = total  # unity / x^(2k + 1)
+    x_squared: int = x * x
+    denominator: int = 1
+    sign: int = 1
+    while power:
+        power //= x_squared
+        denominator += 2
+        sign = -sign
+        total += sign * (power // denominator)
+    return total
+
+
+# pi to any number of decimal places with Machin's formula,
+#   pi = 16 * arctan(1/5) - 4 * arctan(1/239)
+# which gains about 1.4 digits per term, computed in fixed point on
+# integers scaled by 10^(digits + guard digits)
+def machin_pi(digits: int) -> Decimal:
+    guard: int = 10  # extra digits to soak up the truncation in each term
+    unity: int = 10 ** (digits + guard)
+    pi: int = 16 * _arctan_inverse(5, unity) - 4 * _arctan_inverse(239, unity)
+    return Decimal(pi // 10 ** guard).scaleb(-digits, Context(prec=digits + 1))  # exact, unlike the default 28 digits
+
+
 if __name__ == "__main__":
     print(calculate_pi(1000000))
+    print(calculate_pi_blocks(1000000))
+    print(calculate_pi_parallel(1000000))
+    print(machin_pi(50))
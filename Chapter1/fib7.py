@@ -0,0 +1,93 @@
+# fib7.py
+# From Classic Computer Science Problems in Python Chapter 1
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from functools import lru_cache
+from typing import Tuple
+
+MEMO_SIZE: int = 128  # most (fib(n), fib(n + 1)) pairs fib7_memo() keeps
+
+
+# Fast doubling: from fib(k) and fib(k + 1),
+#   fib(2k) = fib(k) * (2 * fib(k + 1) - fib(k))
+#   fib(2k + 1) = fib(k) ** 2 + fib(k + 1) ** 2
+# so walking down the bits of n takes O(log n) steps instead of n additions
+def fib7(n: int) -> int:
+    return fib7_mod(n, 0)
+
+
+# fib(n) % m, keeping every intermediate number below m so they stay small
+# (m = 0 means no modulus at all)
+def fib7_mod(n: int, m: int) -> int:
+    if n < 0:
+        raise ValueError("n must not be negative")
+    last: int = 0  # fib(k), starting with k = 0
+    next: int = 1  # fib(k + 1)
+    for bit in bin(n)[2:]:  # most significant bit first
+        # k -> 2k
+        last, next = last * (2 * next - last), last * last + next * next
+        if bit == "1":  # 2k -> 2k + 1
+            last, next = next, last + next
+        if m:
+            last, next = last % m, next % m
+    return last % m if m else last
+
+
+# The same result from raising [[1, 1], [1, 0]] to the nth power by
+# repeated squaring, which is also O(log n) but does more multiplications
+def fib7_matrix(n: int) -> int:
+    if n < 0:
+        raise ValueError("n must not be negative")
+    # [[a, b], [b, c]]; powers of this matrix are always symmetric
+    result: Tuple[int, int, int] = (1, 0, 1)  # identity
+    power: Tuple[int, int, int] = (1, 1, 0)
+    while n:
+        if n & 1:
+            result = (result[0] * power[0] + result[1] * power[1], result[0] * power[1] + result[1] * power[2],
+                      result[1] * power[1] + result[2] * power[2])
+        power = (power[0] * power[0] + power[1] * power[1], power[0] * power[1] + power[1] * power[2],
+                 power[1] * power[1] + power[2] * power[2])
+        n >>= 1
+    return result[1]
+
+
+# (fib(n), fib(n + 1)) by recursive fast doubling. Each call only needs the
+# pair for n // 2, so calls for nearby n share most of their work, and the
+# cache is bounded so it can't grow forever the way fib3()'s memo does.
+# fib7_pair.cache_info() reports its hits and misses.
+@lru_cache(maxsize=MEMO_SIZE)
+def fib7_pair(n: int) -> Tuple[int, int]:
+    if n == 0:
+        return 0, 1
+    last, next = fib7_pair(n // 2)
+    last, next = last * (2 * next - last), last * last + next * next
+    if n % 2:
+        last, next = next, last + next
+    return last, next
+
+
+def fib7_memo(n: int) -> int:
+    if n < 0:
+        raise ValueError("n must not be negative")
+    return fib7_pair(n)[0]
+
+
+if __name__ == "__main__":
+    print(fib7(5))
+    print(fib7(50))
+    print(fib7_matrix(50))
+    print(fib7_mod(10 ** 18, 1_000_000_007))
+    for n in range(1000, 1010):
+        fib7_memo(n)
+    print(fib7_pair.cache_info())
@@ -0,0 +1,93 @@
+# fib_benchmark.py
+# From Classic Computer Science Problems in Python Chapter 1
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# Times every working Fibonacci function in this chapter (fib1() never
+# stops, on purpose) for growing n, skipping the ones that would take far
+# too long or recurse too deeply
+from typing import Callable, List, Tuple
+from time import perf_counter
+from fib2 import fib2
+import fib3
+from fib4 import fib4
+from fib5 import fib5
+from fib6 import fib6
+from fib7 import fib7, fib7_matrix, fib7_memo, fib7_pair
+
+
+def run_fib3(n: int) -> int:
+    fib3.memo = {0: 0, 1: 1}  # start from an empty memo every time
+    return fib3.fib3(n)
+
+
+def run_fib4(n: int) -> int:
+    fib4.cache_clear()
+    return fib4(n)
+
+
+def run_fib6(n: int) -> int:
+    result: int = 0
+    for result in fib6(n):
+        pass
+    return result
+
+
+def run_fib7_memo(n: int) -> int:
+    fib7_pair.cache_clear()
+    return fib7_memo(n)
+
+
+# name, function and the largest n it's given
+variants: List[Tuple[str, Callable[[int], int], int]] = [
+    ("fib2", fib2, 25),  # exponential
+    ("fib3", run_fib3, 900),  # recursion depth n
+    ("fib4", run_fib4, 450),  # recursion depth n, two frames per level
+    ("fib5", fib5, 10 ** 6),
+    ("fib6", run_fib6, 10 ** 6),
+    ("fib7", fib7, 10 ** 6),
+    ("fib7_matrix", fib7_matrix, 10 ** 6),
+    ("fib7_memo", run_fib7_memo, 10 ** 6),
+]
+
+
+# The fastest of repeats runs of function(n) and what it returned
+def best_time(function: Callable[[int], int], n: int, repeats: int = 3) -> Tuple[float, int]:
+    best: float = float("inf")
+    result: int = 0
+    for _ in range(repeats):
+        start: float = perf_counter()
+        result = function(n)
+        best = min(best, perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    sizes: List[int] = [20, 400, 10 ** 4, 10 ** 5, 10 ** 6]
+    print(f"{'n':>9}" + "".join(f"{name:>13}" for name, _, _ in variants))
+    for n in sizes:
+        expected: int = fib7(n)
+        row: str = f"{n:>9}"
+        for name, function, largest in variants:
+            if n > largest:
+                row += f"{'-':>13}"
+                continue
+            seconds, result = best_time(function, n, 1 if n >= 10 ** 5 else 3)
+            assert result == expected, name
+            row += f"{seconds:>13.6f}"
+        print(row, flush=True)
+    # repeated queries for nearby n are mostly cache hits
+    fib7_pair.cache_clear()
+    for n in range(10 ** 6, 10 ** 6 + 100):
+        fib7_memo(n)
+    print(fib7_pair.cache_info())
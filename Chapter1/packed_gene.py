@@ -0,0 +1,244 @@
+# packed_gene.py
+# From Classic Computer Science Problems in Python Chapter 1
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+from typing import Iterable, Iterator, List, Optional, Union, Any
+from mmap import mmap, ACCESS_READ
+from struct import Struct
+from os import fstat
+
+# Same codes as CompressedGene: A = 00, C = 01, G = 10, T = 11, packed four
+# nucleotides to a byte with the first one in the two highest bits
+_TO_CODES: bytes = bytes({ord(letter): code for code, letters in enumerate(["Aa", "Cc", "Gg", "Tt"])
+                           for letter in letters}.get(byte, 255) for byte in range(256))  # 255 for anything else
+_TO_LETTERS: bytes = bytes.maketrans(b"\x00\x01\x02\x03", b"ACGT")
+_SHIFTS = (6, 4, 2, 0)  # where each of a byte's four nucleotides sits
+_HEADER: Struct = Struct("<4sQ")  # file magic and number of nucleotides
+_MAGIC: bytes = b"2BIT"
+CHUNK_SIZE: int = 1 << 20  # nucleotides handled at a time (a multiple of 4)
+
+
+# Pack nucleotides (ASCII, a multiple of 4 long) into bytes. Rather than
+# looping over every nucleotide, every fourth code (each 0-3) is read as one
+# big int; shifting those into place can't carry between bytes, so OR-ing
+# the four of them together packs the whole chunk at once.
+def _pack(nucleotides: bytes) -> bytes:
+    codes: bytes = nucleotides.translate(_TO_CODES)
+    invalid: int = codes.find(255)
+    if invalid != -1:
+        raise ValueError("Invalid Nucleotide:{}".format(chr(nucleotides[invalid])))
+    packed: int = 0
+    for offset, shift in enumerate(_SHIFTS):
+        packed |= int.from_bytes(codes[offset::4], "big") << shift
+    return packed.to_bytes(len(codes) // 4, "big")
+
+
+# The reverse of _pack(): mask each nucleotide's two bits out of every
+# byte at once and interleave the four results
+def _unpack(packed: Union[bytes, bytearray, memoryview]) -> str:
+    size: int = len(packed)
+    whole: int = int.from_bytes(packed, "big")
+    mask: int = int.from_bytes(b"\x03" * size, "big")
+    codes: bytearray = bytearray(size * 4)
+    for offset, shift in enumerate(_SHIFTS):
+        codes[offset::4] = ((whole >> shift) & mask).to_bytes(size, "big")
+    return codes.translate(_TO_LETTERS).decode("ascii")
+
+
+# The sequence lines of a FASTA file, joined into chunks of about
+# chunk_size nucleotides, so the whole file is never held in memory.
+# Header (>) and comment (;) lines are skipped, so the sequences of
+# all of the records in the file run together.
+def fasta_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    pieces: List[str] = []
+    size: int = 0
+    with open(path) as fasta:
+        for line in fasta:
+            if line.startswith((">", ";")):
+                continue
+            line = line.strip()
+            pieces.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                yield "".join(pieces)
+                pieces = []
+                size = 0
+    if pieces:
+        yield "".join(pieces)
+
+
+# A gene packed two bits to a nucleotide in a bytearray (or, once saved,
+# in a read-only memory-mapped file). Compression is linear in the length
+# of the gene, and single nucleotides or slices can be read without
+# unpacking anything else.
+class PackedGene:
+    def __init__(self, gene: str = "") -> None:
+        self._data: Union[bytearray, memoryview] = bytearray()
+        self._length: int = 0
+        self._mmap: Optional[mmap] = None
+        self.extend(gene)
+
+    # Build a gene from pieces of it, such as the chunks of a large file
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[str]) -> PackedGene:
+        gene: PackedGene = cls()
+        for chunk in chunks:
+            gene.extend(chunk)
+        return gene
+
+    @classmethod
+    def from_fasta(cls, path: str, chunk_size: int = CHUNK_SIZE) -> PackedGene:
+        return cls.from_chunks(fasta_chunks(path, chunk_size))
+
+    # Add nucleotides to the end of the gene
+    def extend(self, nucleotides: str) -> None:
+        if not isinstance(self._data, bytearray):
+            raise TypeError("a memory-mapped PackedGene is read-only")
+        raw: bytes = nucleotides.encode("latin-1", "replace")
+        used: int = self._length % 4  # nucleotides already in the last byte
+        if used and raw:
+            # top up the last byte (its unused bits are zero, an A) first
+            top_up: bytes = raw[:4 - used]
+            self._data[-1] |= _pack(b"A" * used + top_up + b"A" * (4 - used - len(top_up)))[0]
+            self._length += len(top_up)
+            raw = raw[len(top_up):]
+        for start in range(0, len(raw), CHUNK_SIZE):
+            chunk: bytes = raw[start:start + CHUNK_SIZE]
+            self._data += _pack(chunk + b"A" * (-len(chunk) % 4))  # pad out the last byte with As
+            self._length += len(chunk)
+
+    def __len__(self) -> int:
+        return self._length
+
+    # gene[i] is a single nucleotide and gene[start:stop:step] a string of them;
+    # only the bytes that hold the nucleotides asked for are unpacked
+    def __getitem__(self, key: Union[int, slice]) -> str:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                if step < 0:  # unpack the same nucleotides going forwards
+                    if start <= stop:
+                        return ""
+                    return self[stop + 1:start + 1][::step]
+                return self[start:stop][::step]
+            if start >= stop:
+                return ""
+            pieces: List[str] = []
+            for chunk_start in range(start - start % 4, stop, CHUNK_SIZE):
+                chunk_stop: int = min(chunk_start + CHUNK_SIZE, stop)
+                pieces.append(_unpack(self._data[chunk_start // 4:(chunk_stop + 3) // 4]))
+            skip: int = start % 4  # nucleotides unpacked from the first byte before start
+            return "".join(pieces)[skip:skip + stop - start]
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("gene index out of range")
+        return "ACGT"[self._data[key // 4] >> _SHIFTS[key % 4] & 0b11]
+
+    def __iter__(self) -> Iterator[str]:
+        for start in range(0, self._length, CHUNK_SIZE):
+            yield from self[start:start + CHUNK_SIZE]
+
+    def decompress(self) -> str:
+        return self[:]
+
+    def __str__(self) -> str:  # string representation for pretty printing
+        return self.decompress()
+
+    # Write the packed gene to a file that open() can map back in
+    def save(self, path: str) -> None:
+        with open(path, "wb") as packed_file:
+            packed_file.write(_HEADER.pack(_MAGIC, self._length))
+            packed_file.write(self._data)
+
+    # Map a file written by save() or pack_fasta() into memory, read-only;
+    # its pages are only read from disk as they are used
+    @classmethod
+    def open(cls, path: str) -> PackedGene:
+        with open(path, "rb") as packed_file:
+            # too short for a header, or empty, which mmap() won't even take
+            if fstat(packed_file.fileno()).st_size < _HEADER.size:
+                raise ValueError("{} is not a packed gene file".format(path))
+            mapped: mmap = mmap(packed_file.fileno(), 0, access=ACCESS_READ)
+        magic, length = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC or len(mapped) < _HEADER.size + (length + 3) // 4:
+            mapped.close()
+            raise ValueError("{} is not a packed gene file".format(path))
+        gene: PackedGene = cls()
+        gene._mmap = mapped
+        gene._data = memoryview(mapped)[_HEADER.size:]
+        gene._length = length
+        return gene
+
+    # Let go of the mapped file, if there is one
+    def close(self) -> None:
+        if self._mmap is not None:
+            assert isinstance(self._data, memoryview)
+            self._data.release()
+            self._mmap.close()
+            self._mmap = None
+            self._data = bytearray()
+            self._length = 0
+
+    def __enter__(self) -> PackedGene:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+# Compress a FASTA file straight into a packed gene file, a chunk at a
+# time, so files far bigger than memory can be packed. Returns the number
+# of nucleotides written; open the result with PackedGene.open().
+def pack_fasta(fasta_path: str, packed_path: str, chunk_size: int = CHUNK_SIZE) -> int:
+    length: int = 0
+    leftover: bytes = b""  # nucleotides that don't fill a byte yet
+    with open(packed_path, "wb") as packed_file:
+        packed_file.write(_HEADER.pack(_MAGIC, 0))  # length filled in at the end
+        for chunk in fasta_chunks(fasta_path, chunk_size):
+            raw: bytes = leftover + chunk.encode("latin-1", "replace")
+            whole: int = len(raw) - len(raw) % 4
+            packed_file.write(_pack(raw[:whole]))
+            length += whole
+            leftover = raw[whole:]
+        if leftover:
+            packed_file.write(_pack(leftover + b"A" * (4 - len(leftover))))
+            length += len(leftover)
+        packed_file.seek(0)
+        packed_file.write(_HEADER.pack(_MAGIC, length))
+    return length
+
+
+if __name__ == "__main__":
+    from sys import getsizeof
+    from tempfile import TemporaryDirectory
+    import os
+    original: str = "TAGGGATTAACCGTTATATATATATAGCCATGGATCGATTATATAGGGATTAACCGTTATATATATATAGCCATGGATCGATTATA" * 100
+    print("original is {} bytes".format(getsizeof(original)))
+    packed: PackedGene = PackedGene(original)  # compress
+    print("packed is {} bytes".format(getsizeof(packed._data)))
+    print("original and decompressed are the same: {}".format(original == packed.decompress()))
+    print("slices match: {}".format(packed[1000:1010] == original[1000:1010] and packed[-5] == original[-5]))
+
+    with TemporaryDirectory() as directory:
+        fasta_path: str = os.path.join(directory, "gene.fasta")
+        with open(fasta_path, "w") as fasta:
+            fasta.write(">example gene\n")
+            for start in range(0, len(original), 60):  # FASTA wraps its lines
+                fasta.write(original[start:start + 60] + "\n")
+        packed_path: str = os.path.join(directory, "gene.2bit")
+        print("packed {} nucleotides from FASTA".format(pack_fasta(fasta_path, packed_path)))
+        with PackedGene.open(packed_path) as mapped:
+            print("memory-mapped gene matches: {}".format(mapped[:] == original and mapped[4321:4333] == original[4321:4333]))
@@ -0,0 +1,52 @@
+# pi_benchmark.py
+# From Classic Computer Science Problems in Python Chapter 1
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# Reports how many correct digits of pi each way of calculating it
+# produces per second of work
+from typing import Callable, List, Tuple
+from math import pi, log10
+from time import perf_counter
+from calculating_pi import calculate_pi, calculate_pi_blocks, calculate_pi_parallel, machin_pi
+
+
+# The number of decimal places estimate gets right
+def correct_digits(estimate: float) -> float:
+    error: float = abs(estimate - pi)
+    return 15.0 if error == 0.0 else max(0.0, -log10(error))
+
+
+def timed(function: Callable[[], object]) -> Tuple[float, object]:
+    start: float = perf_counter()
+    result: object = function()
+    return perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    print(f"{'mode':<12}{'size':>12}{'digits':>9}{'seconds':>11}{'digits/s':>12}")
+    for n_terms in [10 ** 5, 10 ** 6, 10 ** 7]:
+        modes: List[Tuple[str, Callable[[], float]]] = [
+            ("loop", lambda: calculate_pi(n_terms)),
+            ("blocks", lambda: calculate_pi_blocks(n_terms)),
+            ("parallel", lambda: calculate_pi_parallel(n_terms)),
+        ]
+        for name, function in modes:
+            seconds, estimate = timed(function)
+            digits: float = correct_digits(estimate)  # type: ignore
+            print(f"{name:<12}{n_terms:>12}{digits:>9.1f}{seconds:>11.4f}{digits / seconds:>12.0f}")
+    for digits in [100, 1000, 10000, 50000]:
+        seconds, result = timed(lambda: machin_pi(digits))
+        # check against a few more digits than asked for
+        assert str(machin_pi(digits + 10)).startswith(str(result))
+        print(f"{'machin':<12}{digits:>12}{digits:>9}{seconds:>11.4f}{digits / seconds:>12.0f}")
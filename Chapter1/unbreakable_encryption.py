@@ -14,7 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from secrets import token_bytes
-from typing import Tuple
+from typing import Tuple, Union, Iterator, BinaryIO
+from io import BytesIO
+
+CHUNK_SIZE: int = 1 << 20  # bytes encrypted at a time by the streaming functions
+Source = Union[BinaryIO, bytes, bytearray, memoryview]  # anything the streaming functions read from
 
 
 def random_key(length: int) -> int:
@@ -38,7 +42,95 @@ def decrypt(key1: int, key2: int) -> str:
     return temp.decode()
 
 
+# XOR two equal-length blocks of bytes by treating each as one big int,
+# which does the whole block in C instead of a byte at a time
+def xor_bytes(data: Union[bytes, bytearray, memoryview], key: Union[bytes, bytearray, memoryview]) -> bytes:
+    if len(data) != len(key):
+        raise ValueError("data and key must be the same length")
+    return (int.from_bytes(data, "big") ^ int.from_bytes(key, "big")).to_bytes(len(data), "big")
+
+
+# The contents of a file-like object or an in-memory buffer, chunk_size
+# bytes at a time (buffers are sliced without copying); every chunk but
+# the last is full, so key and ciphertext chunks line up
+def _chunks(source: Source, chunk_size: int) -> Iterator[Union[bytes, memoryview]]:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view: memoryview = memoryview(source).cast("B")
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+        return
+    while True:
+        chunk: bytes = source.read(chunk_size)
+        if not chunk:
+            return
+        # raw and unbuffered streams may return less than asked for before
+        # the end, so top the chunk up; only the last one can come up short
+        if len(chunk) < chunk_size:
+            pieces: bytearray = bytearray(chunk)
+            while len(pieces) < chunk_size:
+                more: bytes = source.read(chunk_size - len(pieces))
+                if not more:
+                    break
+                pieces += more
+            chunk = bytes(pieces)
+        yield chunk
+
+
+# Encrypt source a chunk at a time, writing a fresh random key for each
+# chunk to key_out and the ciphertext to ciphertext_out, so a payload of
+# any size only ever has one chunk in memory. Returns the number of bytes.
+def encrypt_stream(source: Source, key_out: BinaryIO, ciphertext_out: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    total: int = 0
+    for chunk in _chunks(source, chunk_size):
+        key: bytes = token_bytes(len(chunk))
+        key_out.write(key)
+        ciphertext_out.write(xor_bytes(chunk, key))
+        total += len(chunk)
+    return total
+
+
+# The reverse of encrypt_stream(): XOR the key and ciphertext streams back
+# together into plaintext_out. Returns the number of bytes.
+def decrypt_stream(key_in: Source, ciphertext_in: Source, plaintext_out: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    total: int = 0
+    keys: Iterator[Union[bytes, memoryview]] = _chunks(key_in, chunk_size)
+    for chunk in _chunks(ciphertext_in, chunk_size):
+        key: Union[bytes, memoryview] = next(keys, b"")
+        if len(key) != len(chunk):
+            raise ValueError("the key and ciphertext are different lengths")
+        plaintext_out.write(xor_bytes(chunk, key))
+        total += len(chunk)
+    if next(keys, b""):
+        raise ValueError("the key and ciphertext are different lengths")
+    return total
+
+
+# encrypt_stream() and decrypt_stream() for bytes already in memory
+def encrypt_bytes(original: Source) -> Tuple[bytes, bytes]:
+    key: BytesIO = BytesIO()
+    ciphertext: BytesIO = BytesIO()
+    encrypt_stream(original, key, ciphertext)
+    return key.getvalue(), ciphertext.getvalue()
+
+
+def decrypt_bytes(key: Source, ciphertext: Source) -> bytes:
+    plaintext: BytesIO = BytesIO()
+    decrypt_stream(key, ciphertext, plaintext)
+    return plaintext.getvalue()
+
+
 if __name__ == "__main__":
     key1, key2 = encrypt("One Time Pad!")
     result: str = decrypt(key1, key2)
     print(result)
+
+    key, ciphertext = encrypt_bytes("One Time Pad!".encode())
+    print(decrypt_bytes(key, ciphertext).decode())
+    # stream a larger payload through in small chunks
+    payload: bytes = token_bytes(100_000)
+    key_stream: BytesIO = BytesIO()
+    ciphertext_stream: BytesIO = BytesIO()
+    encrypt_stream(BytesIO(payload), key_stream, ciphertext_stream, chunk_size=4096)
+    plaintext_stream: BytesIO = BytesIO()
+    decrypt_stream(key_stream.getbuffer(), ciphertext_stream.getbuffer(), plaintext_stream, chunk_size=4096)
+    print(plaintext_stream.getvalue() == payload)
@@ -0,0 +1,58 @@
+# unbreakable_encryption_tests.py
+# From Classic Computer Science Problems in Python Chapter 1
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from io import BytesIO, RawIOBase
+from secrets import token_bytes
+from unbreakable_encryption import encrypt_stream, decrypt_stream
+
+
+# A raw stream that never returns more than a few bytes per read, like a
+# pipe or socket can
+class TrickleStream(RawIOBase):
+    def __init__(self, data: bytes, most: int) -> None:
+        self._data: BytesIO = BytesIO(data)
+        self._most: int = most
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data: bytes = self._data.read(min(len(buffer), self._most))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class StreamTestCase(unittest.TestCase):
+    def test_short_reads(self):
+        payload: bytes = token_bytes(10_000)
+        key: BytesIO = BytesIO()
+        ciphertext: BytesIO = BytesIO()
+        self.assertEqual(encrypt_stream(TrickleStream(payload, 700), key, ciphertext, chunk_size=4096), len(payload))
+        plaintext: BytesIO = BytesIO()
+        # the two streams come up short at different places
+        total: int = decrypt_stream(TrickleStream(key.getvalue(), 300), TrickleStream(ciphertext.getvalue(), 1000),
+                                    plaintext, chunk_size=4096)
+        self.assertEqual(total, len(payload))
+        self.assertEqual(plaintext.getvalue(), payload)
+
+    def test_length_mismatch(self):
+        plaintext: BytesIO = BytesIO()
+        with self.assertRaises(ValueError):
+            decrypt_stream(TrickleStream(bytes(5000), 300), TrickleStream(bytes(4999), 1000), plaintext, chunk_size=4096)
+
+
+if __name__ == '__main__':
+    unittest.main()
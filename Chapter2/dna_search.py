@@ -13,8 +13,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from __future__ import annotations
 from enum import IntEnum
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Union, Iterable, Sequence
+from array import array
+from bisect import bisect_left, bisect_right
 
 Nucleotide: IntEnum = IntEnum('Nucleotide', ('A', 'C', 'G', 'T'))
 Codon = Tuple[Nucleotide, Nucleotide, Nucleotide]  # type alias for codons
@@ -66,4 +69,117 @@ def binary_contains(gene: Gene, key_codon: Codon) -> bool:
 
 my_sorted_gene: Gene = sorted(my_gene)
 print(binary_contains(my_sorted_gene, acg))  # True
-print(binary_contains(my_sorted_gene, gat))  # False
\ No newline at end of file
+print(binary_contains(my_sorted_gene, gat))  # False
+
+# Codons as small ints: each Nucleotide takes two bits (A = 00 up to T = 11),
+# so a codon is a number from 0 to 63 and a whole gene fits in one byte a codon
+def codon_to_code(codon: Codon) -> int:
+    return (codon[0] - 1) << 4 | (codon[1] - 1) << 2 | (codon[2] - 1)
+
+
+def code_to_codon(code: int) -> Codon:
+    return (Nucleotide((code >> 4) + 1), Nucleotide((code >> 2 & 0b11) + 1), Nucleotide((code & 0b11) + 1))
+
+
+def gene_to_codes(gene: Gene) -> array:
+    return array('B', map(codon_to_code, gene))
+
+
+# the same two bits per nucleotide for k-mers of any length
+nucleotide_codes: Dict[str, int] = {n.name: n.value - 1 for n in Nucleotide}
+Kmer = Union[str, Tuple[Nucleotide, ...], int]  # a k-mer as letters, Nucleotides or its code
+
+
+def _nucleotide_code(nucleotide: Union[str, Nucleotide]) -> int:
+    if isinstance(nucleotide, Nucleotide):
+        return nucleotide.value - 1
+    try:
+        return nucleotide_codes[nucleotide]
+    except KeyError:
+        raise ValueError("Invalid Nucleotide:{}".format(nucleotide)) from None
+
+
+MAX_K: int = 31  # the longest k-mer whose code (2 bits a nucleotide) fits a signed 64-bit array entry
+
+
+def _check_k(k: int) -> None:
+    if not 1 <= k <= MAX_K:
+        raise ValueError("k must be from 1 to {}, not {}".format(MAX_K, k))
+
+
+# Every position of every k-mer in a gene, built once so that lookups don't
+# scan the gene or need a sorted copy of it. The codes of the k-mers are
+# kept sorted in one array with their positions in a parallel array, so all
+# the positions of one k-mer are a single run of it, in ascending order.
+class KmerIndex:
+    def __init__(self, codes: Sequence[int], k: int, step: int = 1) -> None:
+        _check_k(k)
+        self.k: int = k
+        order: List[int] = sorted(range(len(codes)), key=codes.__getitem__)  # stable, so positions stay in order
+        self._codes: array = array('q', (codes[i] for i in order))
+        self._positions: memoryview = memoryview(array('q', (i * step for i in order))).toreadonly()
+
+    # An index of the codons in string_to_gene() output; positions are
+    # indices into the gene
+    @classmethod
+    def from_gene(cls, gene: Gene) -> KmerIndex:
+        return cls(gene_to_codes(gene), 3)
+
+    # An index of every (overlapping) k-mer of a raw string; positions are
+    # offsets into the string. step=3 only takes k-mers starting on codon
+    # boundaries, like string_to_gene().
+    @classmethod
+    def from_string(cls, s: str, k: int = 3, step: int = 1) -> KmerIndex:
+        _check_k(k)
+        mask: int = (1 << 2 * k) - 1
+        rolling: int = 0
+        codes: array = array('q')
+        for i, nucleotide in enumerate(s):
+            rolling = (rolling << 2 | _nucleotide_code(nucleotide)) & mask
+            if i >= k - 1:
+                codes.append(rolling)
+        return cls(codes[::step], k, step)
+
+    def _code(self, kmer: Kmer) -> int:
+        if isinstance(kmer, int):
+            if not 0 <= kmer < 1 << 2 * self.k:
+                raise ValueError("{} is not the code of a {}-mer".format(kmer, self.k))
+            return kmer
+        if len(kmer) != self.k:
+            raise ValueError("{} is not a {}-mer".format(kmer, self.k))
+        code: int = 0
+        for nucleotide in kmer:
+            code = code << 2 | _nucleotide_code(nucleotide)
+        return code
+
+    # The positions of one k-mer, in ascending order (a read-only view)
+    def find(self, kmer: Kmer) -> memoryview:
+        code: int = self._code(kmer)
+        return self._positions[bisect_left(self._codes, code):bisect_right(self._codes, code)]
+
+    def __contains__(self, kmer: Kmer) -> bool:
+        return len(self.find(kmer)) > 0
+
+    # Look up many k-mers at once. They're visited in sorted order so each
+    # binary search only has to cover what's left after the last one.
+    def find_all(self, kmers: Iterable[Kmer]) -> List[memoryview]:
+        codes: List[int] = [self._code(kmer) for kmer in kmers]
+        found: List[memoryview] = [self._positions[0:0]] * len(codes)
+        low: int = 0
+        for i in sorted(range(len(codes)), key=codes.__getitem__):
+            low = bisect_left(self._codes, codes[i], low)
+            high: int = bisect_right(self._codes, codes[i], low)
+            found[i] = self._positions[low:high]
+        return found
+
+    def contains(self, kmers: Iterable[Kmer]) -> List[bool]:
+        return [len(positions) > 0 for positions in self.find_all(kmers)]
+
+
+codon_index: KmerIndex = KmerIndex.from_gene(my_gene)
+print(acg in codon_index)  # True
+print(gat in codon_index)  # False
+print(codon_index.contains([acg, gat, "TTT"]))  # [True, False, True]
+print([list(positions) for positions in codon_index.find_all(["ACG", "CCC"])])  # [[0, 7], [17]]
+kmer_index: KmerIndex = KmerIndex.from_string(gene_str, 5)
+print(list(kmer_index.find("TACGT")))  # [16, 20]
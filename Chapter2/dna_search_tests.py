@@ -0,0 +1,34 @@
+# dna_search_tests.py
+# From Classic Computer Science Problems in Python Chapter 2
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from dna_search import KmerIndex, MAX_K
+
+
+class KmerIndexTestCase(unittest.TestCase):
+    def test_k_bounds(self):
+        gene: str = "ACGT" * 20
+        self.assertEqual(list(KmerIndex.from_string(gene, 1).find("G")), list(range(2, len(gene), 4)))
+        longest: KmerIndex = KmerIndex.from_string(gene, MAX_K)
+        self.assertEqual(list(longest.find(gene[4:4 + MAX_K])), list(range(0, len(gene) - MAX_K + 1, 4)))
+        for k in (0, -1, MAX_K + 1):
+            with self.assertRaises(ValueError):
+                KmerIndex.from_string(gene, k)
+            with self.assertRaises(ValueError):
+                KmerIndex([], k)
+
+
+if __name__ == '__main__':
+    unittest.main()
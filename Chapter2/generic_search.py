@@ -14,9 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from __future__ import annotations
-from typing import TypeVar, Iterable, Sequence, Generic, List, Callable, Set, Deque, Dict, Any, Optional
+from typing import TypeVar, Iterable, Iterator, Sequence, Generic, List, Callable, Set, Deque, Dict, Any, Optional, Tuple, Union
 from typing_extensions import Protocol
 from heapq import heappush, heappop
+from array import array
+from time import perf_counter
 
 T = TypeVar('T')
 
@@ -76,11 +78,16 @@ class Stack(Generic[T]):
     def pop(self) -> T:
         return self._container.pop()  # LIFO
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def __repr__(self) -> str:
         return repr(self._container)
 
 
 class Node(Generic[T]):
+    __slots__ = ('state', 'parent', 'cost', 'heuristic')  # no per-node __dict__
+
     def __init__(self, state: T, parent: Optional[Node], cost: float = 0.0, heuristic: float = 0.0) -> None:
         self.state: T = state
         self.parent: Optional[Node] = parent
@@ -91,12 +98,127 @@ class Node(Generic[T]):
         return (self.cost + self.heuristic) < (other.cost + other.heuristic)
 
 
-def dfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]]) -> Optional[Node[T]]:
+# Maps every state of a problem to a distinct integer in range(state_count)
+# and back. Passing one to dfs(), bfs() or astar() lets them keep integers
+# in the frontier, a bit per state for explored and an array of parent
+# integers instead of a Node per state, which takes far less memory.
+class StateEncoder(Protocol[T]):
+    @property
+    def state_count(self) -> int:
+        ...
+
+    def encode(self, state: T) -> int:
+        ...
+
+    def decode(self, code: int) -> T:
+        ...
+
+
+# A set of the integers 0..size - 1 that uses one bit per integer
+class BitSet:
+    def __init__(self, size: int) -> None:
+        self._bits: bytearray = bytearray((size + 7) // 8)
+        self._count: int = 0
+
+    def add(self, item: int) -> None:
+        if not self._bits[item >> 3] & (1 << (item & 7)):
+            self._bits[item >> 3] |= 1 << (item & 7)
+            self._count += 1
+
+    def __contains__(self, item: int) -> bool:
+        return bool(self._bits[item >> 3] & (1 << (item & 7)))
+
+    def __len__(self) -> int:
+        return self._count
+
+
+NO_PARENT: int = -1  # parent code of the initial state
+
+
+# An array with a parent code for each of the encoder's states
+def parent_array(encoder: StateEncoder[T]) -> array:
+    typecode: str = 'i' if encoder.state_count < 2 ** 31 else 'q'
+    return array(typecode, [NO_PARENT]) * encoder.state_count
+
+
+# Turn the parent codes leading to code back into the Node chain
+# that node_to_path() expects. Each node's cost is its depth.
+def codes_to_node(code: int, parents: array, encoder: StateEncoder[T]) -> Node[T]:
+    codes: List[int] = []
+    while code != NO_PARENT:
+        codes.append(code)
+        code = parents[code]
+    node: Optional[Node[T]] = None
+    for depth, step in enumerate(reversed(codes)):
+        node = Node(encoder.decode(step), node, float(depth))
+    assert node is not None  # codes always holds at least the first code
+    return node
+
+
+# A record of how much work a search did. Pass one as stats= to dfs(),
+# bfs() or astar() (or use search_with_stats()) and it's filled in as the
+# search runs; when stats is None the searches skip all of this.
+class SearchStats:
+    def __init__(self) -> None:
+        self.expanded: int = 0  # states taken off the frontier and given successors
+        self.generated: int = 0  # successors produced for them
+        self.duplicates: int = 0  # successors dropped because they had been explored already
+        self.peak_frontier: int = 0  # most states waiting in the frontier at once
+        self.peak_explored: int = 0  # most states remembered as explored at once
+        self.times: Dict[str, float] = {}  # seconds spent in each phase ("setup", "search", "path")
+        self._phase: Optional[str] = None
+        self._phase_start: float = 0.0
+
+    # End the current phase, if any, and start timing the next one
+    def phase(self, name: Optional[str]) -> None:
+        now: float = perf_counter()
+        if self._phase is not None:
+            self.times[self._phase] = self.times.get(self._phase, 0.0) + now - self._phase_start
+        self._phase = name
+        self._phase_start = now
+
+    # Count one expansion and the sizes it left the frontier and explored at
+    def expand(self, generated: int, frontier_size: int, explored_size: int) -> None:
+        self.expanded += 1
+        self.generated += generated
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if explored_size > self.peak_explored:
+            self.peak_explored = explored_size
+
+    def __repr__(self) -> str:
+        times: str = ", ".join(f"{name}={seconds:.6f}s" for name, seconds in self.times.items())
+        return (f"SearchStats(expanded={self.expanded}, generated={self.generated}, duplicates={self.duplicates}, "
+                f"peak_frontier={self.peak_frontier}, peak_explored={self.peak_explored}, {times})")
+
+
+# Stop the clock on the last phase (if stats are being kept) and pass the result through
+def _finished(result: Optional[Node[T]], stats: Optional[SearchStats]) -> Optional[Node[T]]:
+    if stats is not None:
+        stats.phase(None)
+    return result
+
+
+# Run search (dfs, bfs, astar or anything else that takes stats=) with a
+# fresh SearchStats and return what it found along with the stats
+def search_with_stats(search: Callable[..., Optional[Node[T]]], *args: Any, **kwargs: Any) -> Tuple[Optional[Node[T]], SearchStats]:
+    stats: SearchStats = SearchStats()
+    result: Optional[Node[T]] = search(*args, stats=stats, **kwargs)
+    return result, stats
+
+
+def dfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], encoder: Optional[StateEncoder[T]] = None, stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    if encoder is not None:
+        return _encoded_search(Stack(), initial, goal_test, successors, encoder, stats)
+    if stats is not None:
+        stats.phase("setup")
     # frontier is where we've yet to go
     frontier: Stack[Node[T]] = Stack()
     frontier.push(Node(initial, None))
     # explored is where we've been
     explored: Set[T] = {initial}
+    if stats is not None:
+        stats.phase("search")
 
     # keep going while there is more to explore
     while not frontier.empty:
@@ -104,14 +226,19 @@ def dfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], Li
         current_state: T = current_node.state
         # if we found the goal, we're done
         if goal_test(current_state):
-            return current_node
+            return _finished(current_node, stats)
         # check where we can go next and haven't explored
-        for child in successors(current_state):
+        children: List[T] = successors(current_state)
+        for child in children:
             if child in explored:  # skip children we already explored
+                if stats is not None:
+                    stats.duplicates += 1
                 continue
             explored.add(child)
             frontier.push(Node(child, current_node))
-    return None  # went through everything and never found goal
+        if stats is not None:
+            stats.expand(len(children), len(frontier), len(explored))
+    return _finished(None, stats)  # went through everything and never found goal
 
 
 def node_to_path(node: Node[T]) -> List[T]:
@@ -138,16 +265,25 @@ class Queue(Generic[T]):
     def pop(self) -> T:
         return self._container.popleft()  # FIFO
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def __repr__(self) -> str:
         return repr(self._container)
 
 
-def bfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]]) -> Optional[Node[T]]:
+def bfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], encoder: Optional[StateEncoder[T]] = None, stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    if encoder is not None:
+        return _encoded_search(Queue(), initial, goal_test, successors, encoder, stats)
+    if stats is not None:
+        stats.phase("setup")
     # frontier is where we've yet to go
     frontier: Queue[Node[T]] = Queue()
     frontier.push(Node(initial, None))
     # explored is where we've been
     explored: Set[T] = {initial}
+    if stats is not None:
+        stats.phase("search")
 
     # keep going while there is more to explore
     while not frontier.empty:
@@ -155,14 +291,53 @@ def bfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], Li
         current_state: T = current_node.state
         # if we found the goal, we're done
         if goal_test(current_state):
-            return current_node
+            return _finished(current_node, stats)
         # check where we can go next and haven't explored
-        for child in successors(current_state):
+        children: List[T] = successors(current_state)
+        for child in children:
             if child in explored:  # skip children we already explored
+                if stats is not None:
+                    stats.duplicates += 1
                 continue
             explored.add(child)
             frontier.push(Node(child, current_node))
-    return None  # went through everything and never found goal
+        if stats is not None:
+            stats.expand(len(children), len(frontier), len(explored))
+    return _finished(None, stats)  # went through everything and never found goal
+
+
+# dfs() and bfs() with an encoder; which one depends on the frontier passed in
+def _encoded_search(frontier: Union[Stack[int], Queue[int]], initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], encoder: StateEncoder[T], stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    if stats is not None:
+        stats.phase("setup")
+    first: int = encoder.encode(initial)
+    frontier.push(first)
+    explored: BitSet = BitSet(encoder.state_count)
+    explored.add(first)
+    parents: array = parent_array(encoder)
+    if stats is not None:
+        stats.phase("search")
+
+    while not frontier.empty:
+        current_code: int = frontier.pop()
+        current_state: T = encoder.decode(current_code)
+        if goal_test(current_state):
+            if stats is not None:
+                stats.phase("path")
+            return _finished(codes_to_node(current_code, parents, encoder), stats)
+        children: List[T] = successors(current_state)
+        for child in children:
+            child_code: int = encoder.encode(child)
+            if child_code in explored:  # skip children we already explored
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            explored.add(child_code)
+            parents[child_code] = current_code
+            frontier.push(child_code)
+        if stats is not None:
+            stats.expand(len(children), len(frontier), len(explored))
+    return _finished(None, stats)  # went through everything and never found goal
 
 
 class PriorityQueue(Generic[T]):
@@ -179,16 +354,25 @@ class PriorityQueue(Generic[T]):
     def pop(self) -> T:
         return heappop(self._container)  # out by priority
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def __repr__(self) -> str:
         return repr(self._container)
 
 
-def astar(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float]) -> Optional[Node[T]]:
+def astar(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float], encoder: Optional[StateEncoder[T]] = None, stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    if encoder is not None:
+        return _encoded_astar(initial, goal_test, successors, heuristic, encoder, stats)
+    if stats is not None:
+        stats.phase("setup")
     # frontier is where we've yet to go
     frontier: PriorityQueue[Node[T]] = PriorityQueue()
     frontier.push(Node(initial, None, 0.0, heuristic(initial)))
     # explored is where we've been
     explored: Dict[T, float] = {initial: 0.0}
+    if stats is not None:
+        stats.phase("search")
 
     # keep going while there is more to explore
     while not frontier.empty:
@@ -196,15 +380,337 @@ def astar(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T],
         current_state: T = current_node.state
         # if we found the goal, we're done
         if goal_test(current_state):
-            return current_node
+            return _finished(current_node, stats)
         # check where we can go next and haven't explored
-        for child in successors(current_state):
+        children: List[T] = successors(current_state)
+        for child in children:
             new_cost: float = current_node.cost + 1  # 1 assumes a grid, need a cost function for more sophisticated apps
 
             if child not in explored or explored[child] > new_cost:
                 explored[child] = new_cost
                 frontier.push(Node(child, current_node, new_cost, heuristic(child)))
-    return None  # went through everything and never found goal
+            elif stats is not None:
+                stats.duplicates += 1
+        if stats is not None:
+            stats.expand(len(children), len(frontier), len(explored))
+    return _finished(None, stats)  # went through everything and never found goal
+
+
+# astar() with an encoder: costs live in an array of doubles indexed by code
+# and the frontier holds (cost + heuristic, cost, code) tuples
+def _encoded_astar(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float], encoder: StateEncoder[T], stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    if stats is not None:
+        stats.phase("setup")
+    first: int = encoder.encode(initial)
+    frontier: List[Tuple[float, float, int]] = [(heuristic(initial), 0.0, first)]
+    # explored is where we've been, with the cheapest cost found to get there
+    explored: BitSet = BitSet(encoder.state_count)
+    explored.add(first)
+    costs: array = array('d', [0.0]) * encoder.state_count
+    parents: array = parent_array(encoder)
+    if stats is not None:
+        stats.phase("search")
+
+    while frontier:
+        _, cost, current_code = heappop(frontier)
+        if cost > costs[current_code]:
+            continue  # a cheaper way here was found after this was pushed
+        current_state: T = encoder.decode(current_code)
+        if goal_test(current_state):
+            if stats is not None:
+                stats.phase("path")
+            return _finished(codes_to_node(current_code, parents, encoder), stats)
+        children: List[T] = successors(current_state)
+        for child in children:
+            new_cost: float = cost + 1  # 1 assumes a grid, need a cost function for more sophisticated apps
+            child_code: int = encoder.encode(child)
+            if child_code not in explored or costs[child_code] > new_cost:
+                explored.add(child_code)
+                costs[child_code] = new_cost
+                parents[child_code] = current_code
+                heappush(frontier, (new_cost + heuristic(child), new_cost, child_code))
+            elif stats is not None:
+                stats.duplicates += 1
+        if stats is not None:
+            stats.expand(len(children), len(frontier), len(explored))
+    return _finished(None, stats)  # went through everything and never found goal
+
+
+# Iterative-deepening A*: a series of depth-first searches, each cut off where
+# cost + heuristic passes a bound that starts at heuristic(initial) and rises
+# to the smallest value that was cut off last time. Only the current path is
+# ever in memory. States already on the current path are skipped so cycles
+# don't waste a pass. max_nodes caps the total number of expansions over
+# all passes; None is returned if it runs out before finding the goal.
+def idastar(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float], max_nodes: Optional[int] = None) -> Optional[Node[T]]:
+    bound: float = heuristic(initial)
+    expanded: int = 0
+    while True:
+        root: Node[T] = Node(initial, None, 0.0, heuristic(initial))
+        if goal_test(initial):
+            return root
+        next_bound: float = float("inf")  # smallest cost + heuristic over the bound
+        # the current path, each node with the children it has left to try
+        stack: List[Tuple[Node[T], Iterator[T]]] = [(root, iter(successors(initial)))]
+        on_path: List[T] = [initial]
+        expanded += 1
+        while stack:
+            current_node, children = stack[-1]
+            child: Optional[T] = next(children, None)
+            if child is None:  # tried everything below current_node
+                stack.pop()
+                on_path.pop()
+                continue
+            if child in on_path:  # don't walk in circles
+                continue
+            child_node: Node[T] = Node(child, current_node, current_node.cost + 1, heuristic(child))  # 1 assumes a grid
+            if child_node.cost + child_node.heuristic > bound:
+                next_bound = min(next_bound, child_node.cost + child_node.heuristic)
+                continue
+            if goal_test(child):
+                return child_node
+            if max_nodes is not None and expanded >= max_nodes:
+                return None  # out of budget
+            expanded += 1
+            stack.append((child_node, iter(successors(child))))
+            on_path.append(child)
+        if next_bound == float("inf"):
+            return None  # nothing was cut off, so there's nowhere left to look
+        bound = next_bound
+
+
+# A Node that also remembers what simplified memory-bounded A* needs
+class _BoundedNode(Node[T]):
+    __slots__ = ('f', 'depth', 'children', 'forgotten', 'expanded', 'version')
+
+    def __init__(self, state: T, parent: Optional[_BoundedNode], cost: float, heuristic: float, f: float) -> None:
+        super().__init__(state, parent, cost, heuristic)
+        self.f: float = f  # no solution through here can cost less
+        self.depth: int = 0 if parent is None else parent.depth + 1
+        self.children: Dict[T, _BoundedNode[T]] = {}  # the children still in memory
+        self.forgotten: Dict[T, float] = {}  # children that were dropped, with their f at the time
+        self.expanded: bool = False
+        self.version: int = 0  # bumped whenever it changes; -1 once it's dropped
+
+    # The best anything expanding this node next could lead to: its own f
+    # until it has been expanded, then the best of its forgotten children
+    @property
+    def pending(self) -> float:
+        if not self.expanded:
+            return self.f
+        return min(self.forgotten.values(), default=float("inf"))
+
+
+# A simplified memory-bounded A* (SMA*). It works like astar() but never
+# holds more than max_nodes nodes. When it's over the limit, the worst leaf
+# (highest f, then shallowest) is forgotten, and its parent remembers its f
+# so that one child can be regrown if it becomes the best option again. A
+# node's f is the lowest of its children's, remembered or forgotten, so it
+# never hides a cheaper solution below it. Paths deeper than max_nodes - 1
+# can't fit, so they're cut off. The shortest solution is found if it fits
+# in max_nodes.
+def smastar(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float], max_nodes: int) -> Optional[Node[T]]:
+    root: _BoundedNode[T] = _BoundedNode(initial, None, 0.0, heuristic(initial), heuristic(initial))
+    in_memory: int = 1
+    pushes: int = 0  # tie-breaker, so nodes themselves are never compared
+    # the nodes worth expanding in a min heap by pending, and the leaves in
+    # a max heap by f; entries with an old version are stale
+    best_nodes: List[Tuple[float, int, int, int, _BoundedNode[T]]] = []
+    worst_leaves: List[Tuple[float, int, int, int, _BoundedNode[T]]] = []
+
+    def changed(node: _BoundedNode[T]) -> None:
+        nonlocal pushes
+        node.version += 1
+        pushes += 1
+        if node.pending < float("inf"):
+            heappush(best_nodes, (node.pending, -node.depth, pushes, node.version, node))
+        if not node.children and node.parent is not None:  # the root always stays
+            heappush(worst_leaves, (-node.f, node.depth, pushes, node.version, node))
+
+    # after node's children change, reset its f and pass any change up the tree
+    def back_up(node: _BoundedNode[T]) -> None:
+        while True:
+            old_f: float = node.f
+            node.f = min(min((child.f for child in node.children.values()), default=float("inf")),
+                         min(node.forgotten.values(), default=float("inf")))
+            changed(node)
+            if node.f == old_f or node.parent is None:
+                return
+            node = node.parent  # type: ignore
+
+    changed(root)
+    while best_nodes:
+        _, _, _, version, current_node = heappop(best_nodes)
+        if version != current_node.version:
+            continue  # stale entry
+        new_children: List[_BoundedNode[T]] = []
+        if not current_node.expanded:
+            if goal_test(current_node.state):
+                return current_node
+            current_node.expanded = True
+            if current_node.depth < max_nodes - 1:  # room for a deeper node
+                # children that don't loop back to a state on this path
+                ancestors: List[T] = []
+                ancestor: Optional[Node[T]] = current_node
+                while ancestor is not None:
+                    ancestors.append(ancestor.state)
+                    ancestor = ancestor.parent
+                for child in successors(current_node.state):
+                    if child not in ancestors:
+                        cost: float = current_node.cost + 1  # 1 assumes a grid
+                        child_heuristic: float = heuristic(child)
+                        new_children.append(_BoundedNode(child, current_node, cost, child_heuristic,
+                                                         max(current_node.f, cost + child_heuristic)))
+        else:  # regrow only the best of the forgotten children
+            child = min(current_node.forgotten, key=current_node.forgotten.__getitem__)
+            forgotten_f: float = current_node.forgotten.pop(child)
+            cost = current_node.cost + 1
+            child_heuristic = heuristic(child)
+            new_children.append(_BoundedNode(child, current_node, cost, child_heuristic, max(forgotten_f, cost + child_heuristic)))
+        for child_node in new_children:
+            current_node.children[child_node.state] = child_node
+            changed(child_node)
+            in_memory += 1
+        back_up(current_node)  # with no children at all, f becomes infinite
+        # over budget: forget the worst leaves until everything fits again,
+        # keeping the best new child so the search moves on. The path down
+        # to it is at most max_nodes long, so another leaf can always go.
+        keep: Optional[_BoundedNode[T]] = min(new_children, key=lambda node: node.f, default=None)
+        kept: List[Tuple[float, int, int, int, _BoundedNode[T]]] = []
+        while in_memory > max_nodes:
+            entry: Tuple[float, int, int, int, _BoundedNode[T]] = heappop(worst_leaves)
+            worst: _BoundedNode[T] = entry[4]
+            if entry[3] != worst.version:
+                continue  # stale entry
+            if worst is keep:
+                kept.append(entry)
+                continue
+            worst.version = -1
+            worst_parent: _BoundedNode[T] = worst.parent  # type: ignore
+            del worst_parent.children[worst.state]
+            worst_parent.forgotten[worst.state] = worst.f
+            in_memory -= 1
+            back_up(worst_parent)
+        for entry in kept:
+            heappush(worst_leaves, entry)
+    return None  # every branch is a dead end or too deep to fit
+
+
+# Walk the parent links out from meeting in both directions and return
+# the Node chain for the whole initial -> goal path, with each node's
+# cost being its depth
+def _join_halves(meeting: T, forward_parents: Dict[T, Optional[T]], backward_parents: Dict[T, Optional[T]]) -> Node[T]:
+    states: List[T] = [meeting]
+    parent: Optional[T] = forward_parents[meeting]
+    while parent is not None:
+        states.append(parent)
+        parent = forward_parents[parent]
+    states.reverse()
+    parent = backward_parents[meeting]
+    while parent is not None:
+        states.append(parent)
+        parent = backward_parents[parent]
+    node: Optional[Node[T]] = None
+    for depth, state in enumerate(states):
+        node = Node(state, node, float(depth))
+    assert node is not None  # states always holds at least meeting
+    return node
+
+
+# Breadth-first search from initial and from goal at the same time, always
+# growing whichever side has the smaller frontier by one whole layer, until
+# the two meet in the middle. Pass predecessors if the problem isn't
+# symmetric (if successors(a) containing b doesn't mean successors(b)
+# contains a). Returns the Node for goal, like bfs().
+def bidirectional_bfs(initial: T, goal: T, successors: Callable[[T], List[T]], predecessors: Optional[Callable[[T], List[T]]] = None) -> Optional[Node[T]]:
+    backward_successors: Callable[[T], List[T]] = successors if predecessors is None else predecessors
+    # each side's explored maps states to the state they were reached from
+    forward_parents: Dict[T, Optional[T]] = {initial: None}
+    backward_parents: Dict[T, Optional[T]] = {goal: None}
+    forward_depths: Dict[T, int] = {initial: 0}
+    backward_depths: Dict[T, int] = {goal: 0}
+    if initial == goal:
+        return Node(initial, None)
+    forward_layer: List[T] = [initial]
+    backward_layer: List[T] = [goal]
+
+    while forward_layer and backward_layer:
+        is_forward: bool = len(forward_layer) <= len(backward_layer)
+        layer: List[T] = forward_layer if is_forward else backward_layer
+        expand: Callable[[T], List[T]] = successors if is_forward else backward_successors
+        parents: Dict[T, Optional[T]] = forward_parents if is_forward else backward_parents
+        depths: Dict[T, int] = forward_depths if is_forward else backward_depths
+        other_depths: Dict[T, int] = backward_depths if is_forward else forward_depths
+        next_layer: List[T] = []
+        meeting: Optional[T] = None
+        # finish the whole layer so the shortest of the meetings is kept
+        for current_state in layer:
+            for child in expand(current_state):
+                if child in parents:  # skip children we already explored
+                    continue
+                parents[child] = current_state
+                depths[child] = depths[current_state] + 1
+                next_layer.append(child)
+                if child in other_depths and (meeting is None or other_depths[child] < other_depths[meeting]):
+                    meeting = child
+        if meeting is not None:
+            return _join_halves(meeting, forward_parents, backward_parents)
+        if is_forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+    return None  # one side ran out of states, so there's no path
+
+
+# A* from initial toward goal and from goal toward initial at the same time.
+# heuristic builds a heuristic for a given target, the way
+# manhattan_distance(goal) does, and must be consistent (never drop by more
+# than 1 per step). Each step grows the side with the smaller frontier,
+# and the search ends once either side can't beat the best meeting found.
+# Returns the Node for goal, like astar().
+def bidirectional_astar(initial: T, goal: T, successors: Callable[[T], List[T]], heuristic: Callable[[T], Callable[[T], float]], predecessors: Optional[Callable[[T], List[T]]] = None) -> Optional[Node[T]]:
+    backward_successors: Callable[[T], List[T]] = successors if predecessors is None else predecessors
+    forward_heuristic: Callable[[T], float] = heuristic(goal)
+    backward_heuristic: Callable[[T], float] = heuristic(initial)
+    forward_frontier: PriorityQueue[Node[T]] = PriorityQueue()
+    forward_frontier.push(Node(initial, None, 0.0, forward_heuristic(initial)))
+    backward_frontier: PriorityQueue[Node[T]] = PriorityQueue()
+    backward_frontier.push(Node(goal, None, 0.0, backward_heuristic(goal)))
+    # cheapest known cost to each state from its side's start, and where it came from
+    forward_costs: Dict[T, float] = {initial: 0.0}
+    backward_costs: Dict[T, float] = {goal: 0.0}
+    forward_parents: Dict[T, Optional[T]] = {initial: None}
+    backward_parents: Dict[T, Optional[T]] = {goal: None}
+    best: float = 0.0 if initial == goal else float("inf")  # cost of the best meeting so far
+    meeting: Optional[T] = initial if initial == goal else None
+
+    while not forward_frontier.empty and not backward_frontier.empty:
+        is_forward: bool = len(forward_frontier) <= len(backward_frontier)
+        frontier: PriorityQueue[Node[T]] = forward_frontier if is_forward else backward_frontier
+        expand: Callable[[T], List[T]] = successors if is_forward else backward_successors
+        estimate: Callable[[T], float] = forward_heuristic if is_forward else backward_heuristic
+        costs: Dict[T, float] = forward_costs if is_forward else backward_costs
+        other_costs: Dict[T, float] = backward_costs if is_forward else forward_costs
+        parents: Dict[T, Optional[T]] = forward_parents if is_forward else backward_parents
+        current_node: Node[T] = frontier.pop()
+        current_state: T = current_node.state
+        if current_node.cost > costs[current_state]:
+            continue  # a cheaper way here was found after this was pushed
+        if current_node.cost + current_node.heuristic >= best:
+            break  # nothing left on this side can lead to a cheaper path
+        for child in expand(current_state):
+            new_cost: float = current_node.cost + 1  # 1 assumes a grid, need a cost function for more sophisticated apps
+            if child not in costs or costs[child] > new_cost:
+                costs[child] = new_cost
+                parents[child] = current_state
+                frontier.push(Node(child, current_node, new_cost, estimate(child)))
+                if child in other_costs and new_cost + other_costs[child] < best:
+                    best = new_cost + other_costs[child]
+                    meeting = child
+
+    if meeting is None:
+        return None  # the two sides never met
+    return _join_halves(meeting, forward_parents, backward_parents)
 
 
 if __name__ == "__main__":
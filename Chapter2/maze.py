@@ -14,10 +14,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from enum import Enum
-from typing import List, NamedTuple, Callable, Optional
+from typing import List, NamedTuple, Callable, Optional, Tuple, Dict, Set, Deque, Any
 import random
 from math import sqrt
-from generic_search import dfs, bfs, node_to_path, astar, Node
+from heapq import heappush, heappop
+from array import array
+from weakref import WeakSet
+from generic_search import dfs, bfs, node_to_path, astar, smastar, Node, bidirectional_bfs, bidirectional_astar, search_with_stats
 
 
 class Cell(str, Enum):
@@ -28,6 +31,9 @@ class Cell(str, Enum):
     PATH = "*"
 
 
+BLOCKED: int = ord(Cell.BLOCKED)  # the byte a blocked cell is stored as
+
+
 class MazeLocation(NamedTuple):
     row: int
     column: int
@@ -40,25 +46,58 @@ class Maze:
         self._columns: int = columns
         self.start: MazeLocation = start
         self.goal: MazeLocation = goal
-        # fill the grid with empty cells
-        self._grid: List[List[Cell]] = [[Cell.EMPTY for c in range(columns)] for r in range(rows)]
-        # populate the grid with blocked cells
+        # the grid is stored row by row, one byte (the Cell's character) per cell,
+        # so even very large mazes take one byte a cell instead of a list entry
+        self._grid: bytearray = bytearray(rows * columns)
+        # fill the grid with empty and blocked cells
         self._randomly_fill(rows, columns, sparseness)
         # fill the start and goal locations in
-        self._grid[start.row][start.column] = Cell.START
-        self._grid[goal.row][goal.column] = Cell.GOAL
+        self._set(start, Cell.START)
+        self._set(goal, Cell.GOAL)
+        # distance fields to tell whenever a cell is blocked or unblocked
+        self._fields: 'WeakSet[DistanceField]' = WeakSet()
+
+    # A WeakSet can't be pickled, so a pickled Maze (say, one sent to a
+    # spawned process) leaves its fields behind and starts with none
+    def __getstate__(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = self.__dict__.copy()
+        del state["_fields"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._fields = WeakSet()
 
     def _randomly_fill(self, rows: int, columns: int, sparseness: float):
-        for row in range(rows):
-            for column in range(columns):
-                if random.uniform(0, 1.0) < sparseness:
-                    self._grid[row][column] = Cell.BLOCKED
+        empty: int = ord(Cell.EMPTY)
+        self._grid[:] = bytes(BLOCKED if random.random() < sparseness else empty for _ in range(rows * columns))
+
+    def _set(self, ml: MazeLocation, cell: Cell) -> None:
+        self._grid[ml.row * self._columns + ml.column] = ord(cell)
+
+    def cell_at(self, ml: MazeLocation) -> Cell:
+        return Cell(chr(self._grid[ml.row * self._columns + ml.column]))
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    # The grid row by row, one byte (the Cell's character) per cell, for
+    # searches that work on cell indices; read-only, so change cells
+    # through block() and unblock()
+    @property
+    def cells(self) -> memoryview:
+        return memoryview(self._grid).toreadonly()
 
     # return a nicely formatted version of the maze for printing
     def __str__(self) -> str:
         output: str = ""
-        for row in self._grid:
-            output += "".join([c.value for c in row]) + "\n"
+        for row in range(self._rows):
+            output += self._grid[row * self._columns:(row + 1) * self._columns].decode() + "\n"
         return output
 
     def goal_test(self, ml: MazeLocation) -> bool:
@@ -66,27 +105,80 @@ class Maze:
 
     def successors(self, ml: MazeLocation) -> List[MazeLocation]:
         locations: List[MazeLocation] = []
-        if ml.row + 1 < self._rows and self._grid[ml.row + 1][ml.column] != Cell.BLOCKED:
+        index: int = ml.row * self._columns + ml.column
+        if ml.row + 1 < self._rows and self._grid[index + self._columns] != BLOCKED:
             locations.append(MazeLocation(ml.row + 1, ml.column))
-        if ml.row - 1 >= 0 and self._grid[ml.row - 1][ml.column] != Cell.BLOCKED:
+        if ml.row - 1 >= 0 and self._grid[index - self._columns] != BLOCKED:
             locations.append(MazeLocation(ml.row - 1, ml.column))
-        if ml.column + 1 < self._columns and self._grid[ml.row][ml.column + 1] != Cell.BLOCKED:
+        if ml.column + 1 < self._columns and self._grid[index + 1] != BLOCKED:
             locations.append(MazeLocation(ml.row, ml.column + 1))
-        if ml.column - 1 >= 0 and self._grid[ml.row][ml.column - 1] != Cell.BLOCKED:
+        if ml.column - 1 >= 0 and self._grid[index - 1] != BLOCKED:
             locations.append(MazeLocation(ml.row, ml.column - 1))
         return locations
 
+    # A Maze is its own StateEncoder: each location is numbered row by row
+    @property
+    def state_count(self) -> int:
+        return self._rows * self._columns
+
+    def encode(self, ml: MazeLocation) -> int:
+        return ml.row * self._columns + ml.column
+
+    def decode(self, code: int) -> MazeLocation:
+        return MazeLocation(*divmod(code, self._columns))
+
     def mark(self, path: List[MazeLocation]):
         for maze_location in path:
-            self._grid[maze_location.row][maze_location.column] = Cell.PATH
-        self._grid[self.start.row][self.start.column] = Cell.START
-        self._grid[self.goal.row][self.goal.column] = Cell.GOAL
+            self._set(maze_location, Cell.PATH)
+        self._set(self.start, Cell.START)
+        self._set(self.goal, Cell.GOAL)
     
     def clear(self, path: List[MazeLocation]):
         for maze_location in path:
-            self._grid[maze_location.row][maze_location.column] = Cell.EMPTY
-        self._grid[self.start.row][self.start.column] = Cell.START
-        self._grid[self.goal.row][self.goal.column] = Cell.GOAL
+            self._set(maze_location, Cell.EMPTY)
+        self._set(self.start, Cell.START)
+        self._set(self.goal, Cell.GOAL)
+
+    # The codes of the open cells next to the cell with code, in the same
+    # order successors() gives their locations
+    def successor_codes(self, code: int) -> List[int]:
+        grid: bytearray = self._grid
+        columns: int = self._columns
+        row, column = divmod(code, columns)
+        codes: List[int] = []
+        if row + 1 < self._rows and grid[code + columns] != BLOCKED:
+            codes.append(code + columns)
+        if row - 1 >= 0 and grid[code - columns] != BLOCKED:
+            codes.append(code - columns)
+        if column + 1 < columns and grid[code + 1] != BLOCKED:
+            codes.append(code + 1)
+        if column - 1 >= 0 and grid[code - 1] != BLOCKED:
+            codes.append(code - 1)
+        return codes
+
+    # Have block() and unblock() keep field up to date from now on, for as
+    # long as the field is around
+    def attach(self, field: 'DistanceField') -> None:
+        self._fields.add(field)
+
+    def block(self, ml: MazeLocation) -> None:
+        was_blocked: bool = self.cell_at(ml) == Cell.BLOCKED
+        self._set(ml, Cell.BLOCKED)
+        if not was_blocked:
+            for field in list(self._fields):
+                field._blocked(ml)
+
+    def unblock(self, ml: MazeLocation) -> None:
+        was_blocked: bool = self.cell_at(ml) == Cell.BLOCKED
+        if ml == self.start:
+            self._set(ml, Cell.START)
+        elif ml == self.goal:
+            self._set(ml, Cell.GOAL)
+        else:
+            self._set(ml, Cell.EMPTY)
+        if was_blocked:
+            for field in list(self._fields):
+                field._unblocked(ml)
 
 
 def euclidean_distance(goal: MazeLocation) -> Callable[[MazeLocation], float]:
@@ -105,6 +197,253 @@ def manhattan_distance(goal: MazeLocation) -> Callable[[MazeLocation], float]:
     return distance
 
 
+# The heuristic for mazes where diagonal steps are allowed and cost sqrt(2)
+def octile_distance(goal: MazeLocation) -> Callable[[MazeLocation], float]:
+    def distance(ml: MazeLocation) -> float:
+        xdist: int = abs(ml.column - goal.column)
+        ydist: int = abs(ml.row - goal.row)
+        return max(xdist, ydist) + (sqrt(2) - 1) * min(xdist, ydist)
+    return distance
+
+
+# Jump Point Search: A* that, instead of adding every neighbor to the
+# frontier, jumps in a straight line (or diagonally when diagonal is True)
+# until it reaches a cell where a shortest path could turn, skipping all of
+# the equally short paths that just reorder the same moves. Steps cost 1
+# (sqrt(2) for diagonal ones, which may not cut past a blocked corner).
+# Returns the Node for the goal with every cell along the way, so the path
+# is as long as astar() with manhattan_distance() (or octile_distance())
+# would find.
+def jump_point_search(maze: Maze, diagonal: bool = False) -> Optional[Node[MazeLocation]]:
+    grid: memoryview = maze.cells
+    rows: int = maze.rows
+    columns: int = maze.columns
+    goal_row, goal_column = maze.goal
+
+    def walkable(row: int, column: int) -> bool:
+        return 0 <= row < rows and 0 <= column < columns and grid[row * columns + column] != BLOCKED
+
+    # Step from (row, column) in direction (drow, dcolumn) and return the
+    # first jump point: the goal, or a cell with a neighbor that can only be
+    # reached optimally through it (a forced neighbor)
+    def jump(row: int, column: int, drow: int, dcolumn: int) -> Optional[Tuple[int, int]]:
+        while walkable(row, column):
+            if row == goal_row and column == goal_column:
+                return row, column
+            if drow != 0 and dcolumn != 0:  # a diagonal move turns if either straight line does
+                if jump(row, column + dcolumn, 0, dcolumn) is not None or jump(row + drow, column, drow, 0) is not None:
+                    return row, column
+                if not (walkable(row, column + dcolumn) and walkable(row + drow, column)):
+                    return None  # can't cut the corner
+            elif dcolumn != 0:  # horizontal
+                if (walkable(row - 1, column) and not walkable(row - 1, column - dcolumn)) or \
+                        (walkable(row + 1, column) and not walkable(row + 1, column - dcolumn)):
+                    return row, column
+            else:  # vertical
+                if (walkable(row, column - 1) and not walkable(row - drow, column - 1)) or \
+                        (walkable(row, column + 1) and not walkable(row - drow, column + 1)):
+                    return row, column
+                # without diagonals, vertical moves turn wherever a horizontal one would
+                if not diagonal and (jump(row, column + 1, 0, 1) is not None or jump(row, column - 1, 0, -1) is not None):
+                    return row, column
+            row += drow
+            column += dcolumn
+        return None
+
+    # The directions worth jumping in from (row, column) when it was reached
+    # moving in direction (drow, dcolumn), or every direction at the start
+    def directions(row: int, column: int, drow: int, dcolumn: int) -> List[Tuple[int, int]]:
+        straight: List[Tuple[int, int]] = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        if drow == 0 and dcolumn == 0:
+            if diagonal:
+                return straight + [(dr, dc) for dr in (1, -1) for dc in (1, -1)
+                                   if walkable(row + dr, column) and walkable(row, column + dc)]
+            return straight
+        if drow != 0 and dcolumn != 0:
+            moves: List[Tuple[int, int]] = [(drow, 0), (0, dcolumn)]
+            if walkable(row + drow, column) and walkable(row, column + dcolumn):
+                moves.append((drow, dcolumn))
+            return moves
+        if not diagonal or not walkable(row + drow, column + dcolumn):
+            # forward, or turning to either side
+            return [(drow, dcolumn), (dcolumn, drow), (-dcolumn, -drow)]
+        # forward, either side, and diagonally forward past any open side
+        moves = [(drow, dcolumn), (dcolumn, drow), (-dcolumn, -drow)]
+        for side_row, side_column in ((dcolumn, drow), (-dcolumn, -drow)):
+            if walkable(row + side_row, column + side_column):
+                moves.append((drow + side_row, dcolumn + side_column))
+        return moves
+
+    def distance(row1: int, column1: int, row2: int, column2: int) -> float:
+        rows_apart: int = abs(row1 - row2)
+        columns_apart: int = abs(column1 - column2)
+        if diagonal:
+            return max(rows_apart, columns_apart) + (sqrt(2) - 1) * min(rows_apart, columns_apart)
+        return rows_apart + columns_apart
+
+    start: Tuple[int, int] = (maze.start.row, maze.start.column)
+    # ordered by cost + heuristic, then deepest first to break the many ties
+    frontier: List[Tuple[float, float, Tuple[int, int]]] = [(distance(*start, goal_row, goal_column), -0.0, start)]
+    costs: Dict[Tuple[int, int], float] = {start: 0.0}
+    parents: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    while frontier:
+        _, negative_cost, current = heappop(frontier)
+        cost: float = -negative_cost
+        if cost > costs[current]:
+            continue  # stale entry, already reached more cheaply
+        row, column = current
+        if row == goal_row and column == goal_column:
+            # fill in every cell between consecutive jump points
+            jump_points: List[Tuple[int, int]] = [current]
+            while jump_points[-1] in parents:
+                jump_points.append(parents[jump_points[-1]])
+            jump_points.reverse()
+            node: Node[MazeLocation] = Node(maze.start, None)
+            for (row1, column1), (row2, column2) in zip(jump_points, jump_points[1:]):
+                drow: int = (row2 > row1) - (row2 < row1)
+                dcolumn: int = (column2 > column1) - (column2 < column1)
+                while (row1, column1) != (row2, column2):
+                    row1 += drow
+                    column1 += dcolumn
+                    node = Node(MazeLocation(row1, column1), node, node.cost + distance(0, 0, drow, dcolumn))
+            return node
+        parent: Optional[Tuple[int, int]] = parents.get(current)
+        drow = dcolumn = 0
+        if parent is not None:
+            drow = (row > parent[0]) - (row < parent[0])
+            dcolumn = (column > parent[1]) - (column < parent[1])
+        for move_row, move_column in directions(row, column, drow, dcolumn):
+            found: Optional[Tuple[int, int]] = jump(row + move_row, column + move_column, move_row, move_column)
+            if found is None:
+                continue
+            new_cost: float = cost + distance(row, column, *found)
+            if found not in costs or new_cost < costs[found]:
+                costs[found] = new_cost
+                parents[found] = current
+                heappush(frontier, (new_cost + distance(*found, goal_row, goal_column), -new_cost, found))
+    return None  # went through everything and never found goal
+
+
+UNREACHABLE: int = -1  # distance field entry for cells that can't reach the goal
+
+
+# The number of steps from every cell of a maze to its goal, worked out
+# once with a breadth-first search backwards from the goal and kept in a
+# flat array of ints (one per cell, row by row). A shortest path from any
+# start is then just a walk downhill through the field. The maze tells the
+# field whenever a cell is blocked or unblocked (whether through the field
+# or the maze itself), and only the part of the field that changes is
+# repaired.
+class DistanceField:
+    def __init__(self, maze: Maze) -> None:
+        self._maze: Maze = maze
+        self.goal: MazeLocation = maze.goal
+        self._distances: array = array('i', [UNREACHABLE]) * maze.state_count
+        goal: int = maze.encode(self.goal)
+        if maze.cell_at(self.goal) != Cell.BLOCKED:
+            self._distances[goal] = 0
+            self._spread(Deque([goal]))
+        maze.attach(self)
+
+    # Breadth-first from the cells in frontier (in order of distance),
+    # lowering any neighbor that can be reached in fewer steps
+    def _spread(self, frontier: Deque[int]) -> None:
+        distances: array = self._distances
+        while frontier:
+            current: int = frontier.popleft()
+            next_distance: int = distances[current] + 1
+            for neighbor in self._maze.successor_codes(current):
+                if distances[neighbor] == UNREACHABLE or next_distance < distances[neighbor]:
+                    distances[neighbor] = next_distance
+                    frontier.append(neighbor)
+
+    # Steps from ml to the goal, or None if the goal can't be reached
+    def distance(self, ml: MazeLocation) -> Optional[int]:
+        distance: int = self._distances[self._maze.encode(ml)]
+        return None if distance == UNREACHABLE else distance
+
+    # A shortest path from start to the goal, as the Node for the goal like
+    # the searches in generic_search return, or None if there isn't one
+    def path_from(self, start: MazeLocation) -> Optional[Node[MazeLocation]]:
+        current: int = self._maze.encode(start)
+        if self._distances[current] == UNREACHABLE:
+            return None
+        node: Node[MazeLocation] = Node(start, None)
+        while self._distances[current] > 0:
+            # any neighbor one step closer will do
+            current = next(neighbor for neighbor in self._maze.successor_codes(current)
+                           if self._distances[neighbor] == self._distances[current] - 1)
+            node = Node(self._maze.decode(current), node, node.cost + 1)
+        return node
+
+    # The same as unblocking the cell in the maze
+    def unblock(self, ml: MazeLocation) -> None:
+        self._maze.unblock(ml)
+
+    # The same as blocking the cell in the maze
+    def block(self, ml: MazeLocation) -> None:
+        self._maze.block(ml)
+
+    # Called by the maze once a cell has been opened up: spread out from it
+    # whatever it makes shorter
+    def _unblocked(self, ml: MazeLocation) -> None:
+        index: int = self._maze.encode(ml)
+        if ml == self.goal:
+            self._distances[index] = 0
+        else:
+            reachable: List[int] = [self._distances[neighbor] for neighbor in self._maze.successor_codes(index)
+                                    if self._distances[neighbor] != UNREACHABLE]
+            if not reachable:
+                return  # still cut off from the goal
+            self._distances[index] = min(reachable) + 1
+        self._spread(Deque([index]))
+
+    # Called by the maze once a cell has been blocked. Only the cells whose
+    # every shortest path ran through it get worse, so those are found,
+    # cleared and filled back in from the cells around them, leaving the
+    # rest of the field alone.
+    def _blocked(self, ml: MazeLocation) -> None:
+        distances: array = self._distances
+        index: int = self._maze.encode(ml)
+        if distances[index] == UNREACHABLE:
+            return  # nothing went through it
+        # walk outwards a layer at a time; a cell is affected if all of its
+        # open neighbors one step closer to the goal are affected (the
+        # blocked cell no longer counts as a neighbor, so a cell that was
+        # only one step closer through it has none left and is affected)
+        affected: Set[int] = {index}
+        layer: Deque[int] = Deque([index])
+        while layer:
+            current: int = layer.popleft()
+            for neighbor in self._maze.successor_codes(current):
+                if neighbor in affected or distances[neighbor] != distances[current] + 1:
+                    continue
+                if all(closer in affected for closer in self._maze.successor_codes(neighbor)
+                       if distances[closer] == distances[neighbor] - 1):
+                    affected.add(neighbor)
+                    layer.append(neighbor)
+        for cell in affected:
+            distances[cell] = UNREACHABLE
+        # fill the affected cells back in from their unaffected neighbors,
+        # cheapest first, since they start at different distances
+        frontier: List[Tuple[int, int]] = []
+        for cell in affected:
+            if cell == index:
+                continue
+            for neighbor in self._maze.successor_codes(cell):
+                if distances[neighbor] != UNREACHABLE and (distances[cell] == UNREACHABLE or distances[neighbor] + 1 < distances[cell]):
+                    distances[cell] = distances[neighbor] + 1
+            if distances[cell] != UNREACHABLE:
+                heappush(frontier, (distances[cell], cell))
+        while frontier:
+            distance, current = heappop(frontier)
+            if distance > distances[current]:
+                continue  # stale entry, already lowered
+            for neighbor in self._maze.successor_codes(current):
+                if distances[neighbor] == UNREACHABLE or distance + 1 < distances[neighbor]:
+                    distances[neighbor] = distance + 1
+                    heappush(frontier, (distance + 1, neighbor))
+
 if __name__ == "__main__":
     # Test DFS
     m: Maze = Maze()
@@ -134,4 +473,82 @@ if __name__ == "__main__":
     else:
         path3: List[MazeLocation] = node_to_path(solution3)
         m.mark(path3)
-        print(m)
\ No newline at end of file
+        print(m)
+        m.clear(path3)
+    # Test A* again, tracking explored locations with a bitset
+    solution4: Optional[Node[MazeLocation]] = astar(m.start, m.goal_test, m.successors, distance, m)
+    if solution4 is None:
+        print("No solution found using encoded A*!")
+    else:
+        path4: List[MazeLocation] = node_to_path(solution4)
+        print(f"Encoded A* found a path of the same length: {len(path4) == len(path3)}")
+    # Test the bidirectional searches, which should match BFS's path length
+    solution5: Optional[Node[MazeLocation]] = bidirectional_bfs(m.start, m.goal, m.successors)
+    solution6: Optional[Node[MazeLocation]] = bidirectional_astar(m.start, m.goal, m.successors, manhattan_distance)
+    if solution5 is None or solution6 is None:
+        print("No solution found using bidirectional search!")
+    else:
+        path5: List[MazeLocation] = node_to_path(solution5)
+        m.mark(path5)
+        print(m)
+        m.clear(path5)
+        print(f"Bidirectional A* found a path of the same length: {len(node_to_path(solution6)) == len(path5)}")
+    # Test Jump Point Search, which should match A*'s path length
+    solution7: Optional[Node[MazeLocation]] = jump_point_search(m)
+    if solution7 is None:
+        print("No solution found using Jump Point Search!")
+    else:
+        path7: List[MazeLocation] = node_to_path(solution7)
+        m.mark(path7)
+        print(m)
+        m.clear(path7)
+        print(f"Jump Point Search found a path of the same length: {solution3 is not None and len(path7) == len(node_to_path(solution3))}")
+    solution8: Optional[Node[MazeLocation]] = jump_point_search(m, diagonal=True)
+    if solution8 is not None:
+        path8: List[MazeLocation] = node_to_path(solution8)
+        m.mark(path8)
+        print(m)
+        m.clear(path8)
+    # Answer paths from many starts with one distance field to the goal
+    field: DistanceField = DistanceField(m)
+    for start in [m.start, MazeLocation(0, 9), MazeLocation(9, 0)]:
+        print(f"Steps from {start} to the goal: {field.distance(start)}")
+    if solution2 is not None:
+        # block a cell on the BFS path and the field repairs itself around it
+        middle: MazeLocation = node_to_path(solution2)[len(path2) // 2]
+        field.block(middle)
+        solution9: Optional[Node[MazeLocation]] = field.path_from(m.start)
+        if solution9 is None:
+            print("No path left after blocking a cell!")
+        else:
+            path9: List[MazeLocation] = node_to_path(solution9)
+            m.mark(path9)
+            print(m)
+            m.clear(path9)
+        # the maze tells the field about cells unblocked through it too
+        m.unblock(middle)
+        print(f"Field matches a new one after unblocking: {field.distance(m.start) == DistanceField(m).distance(m.start)}")
+    # Compare how much work A* does with each heuristic
+    for name, heuristic in [("euclidean", euclidean_distance(m.goal)), ("manhattan", distance)]:
+        solution10, stats = search_with_stats(astar, m.start, m.goal_test, m.successors, heuristic)
+        print(f"A* with {name} distance: {stats}")
+    # SMA* should find a path as short as BFS's whenever one fits in its
+    # budget and nothing otherwise, however tight the budget is
+    random.seed(1)
+    checked: int = 0
+    agreed: int = 0
+    while checked < 200:
+        small: Maze = Maze(8, 10, 0.2, MazeLocation(random.randrange(8), random.randrange(10)),
+                           MazeLocation(random.randrange(8), random.randrange(10)))
+        shortest: Optional[Node[MazeLocation]] = bfs(small.start, small.goal_test, small.successors)
+        if shortest is None:
+            continue  # SMA* would try every path before giving up
+        length: int = len(node_to_path(shortest))
+        max_nodes: int = random.randint(max(1, length - 2), 4 * length)
+        bounded: Optional[Node[MazeLocation]] = smastar(small.start, small.goal_test, small.successors,
+                                                        manhattan_distance(small.goal), max_nodes)
+        checked += 1
+        found: Optional[int] = None if bounded is None else len(node_to_path(bounded))
+        if found == (length if length <= max_nodes else None):
+            agreed += 1
+    print(f"SMA* agreed with BFS in {agreed} of {checked} random mazes")
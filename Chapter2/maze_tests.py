@@ -0,0 +1,40 @@
+# maze_tests.py
+# From Classic Computer Science Problems in Python Chapter 2
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+import pickle
+from maze import Maze, MazeLocation, DistanceField
+
+
+class MazePickleTestCase(unittest.TestCase):
+    def test_pickle_with_field(self):
+        maze: Maze = Maze(10, 10, 0.0, MazeLocation(0, 0), MazeLocation(9, 9))
+        field: DistanceField = DistanceField(maze)
+        copy: Maze = pickle.loads(pickle.dumps(maze))
+        self.assertEqual(str(copy), str(maze))
+        self.assertEqual(copy.successors(MazeLocation(5, 5)), maze.successors(MazeLocation(5, 5)))
+        # the copy's fields are its own, so changing it leaves field alone
+        copy.block(MazeLocation(8, 9))
+        copy.block(MazeLocation(9, 8))
+        self.assertEqual(field.distance(MazeLocation(0, 0)), 18)
+        self.assertIsNone(DistanceField(copy).distance(MazeLocation(0, 0)))
+        # while the original still keeps field up to date
+        maze.block(MazeLocation(8, 9))
+        self.assertEqual(field.distance(MazeLocation(9, 8)), 1)
+        self.assertIsNone(field.distance(MazeLocation(8, 9)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -72,6 +72,22 @@ class MCState:
         return [x for x in sucs if x.is_legal]
 
 
+# Numbers every (west missionaries, west cannibals, boat) combination
+# so that the searches can track MCStates by integer
+class MCStateEncoder:
+    @property
+    def state_count(self) -> int:
+        return (MAX_NUM + 1) * (MAX_NUM + 1) * 2
+
+    def encode(self, state: MCState) -> int:
+        return (state.wm * (MAX_NUM + 1) + state.wc) * 2 + int(state.boat)
+
+    def decode(self, code: int) -> MCState:
+        rest, boat = divmod(code, 2)
+        missionaries, cannibals = divmod(rest, MAX_NUM + 1)
+        return MCState(missionaries, cannibals, bool(boat))
+
+
 def display_solution(path: List[MCState]):
     if len(path) == 0: # sanity check
         return
@@ -96,3 +112,8 @@ if __name__ == "__main__":
     else:
         path: List[MCState] = node_to_path(solution)
         display_solution(path)
+    # MCState has no __eq__ or __hash__, so only the encoded
+    # search can tell when it has seen a state before
+    encoded_solution: Optional[Node[MCState]] = bfs(start, MCState.goal_test, MCState.successors, MCStateEncoder())
+    if encoded_solution is not None:
+        print(f"Encoded BFS found a solution in {len(node_to_path(encoded_solution)) - 1} crossings.")
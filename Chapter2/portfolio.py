@@ -0,0 +1,153 @@
+# portfolio.py
+# From Classic Computer Science Problems in Python Chapter 2
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+from typing import TypeVar, NamedTuple, Callable, Sequence, List, Tuple, Set, Optional, Any
+from multiprocessing import get_context, get_all_start_methods
+from multiprocessing.context import BaseContext
+from queue import Empty
+from time import perf_counter
+from generic_search import Node, node_to_path
+
+T = TypeVar('T')
+_POLL: float = 0.1  # seconds between checks that the workers are still alive
+
+
+# One way of searching a problem: search is called as
+# search(initial, goal_test, successors, *args), so args holds anything
+# that comes after those, like astar()'s heuristic or an encoder
+class SearchConfig(NamedTuple):
+    name: str
+    search: Callable[..., Optional[Node]]
+    args: Tuple[Any, ...] = ()
+
+
+# The solution a portfolio settled on and the configuration that found it
+class PortfolioResult(NamedTuple):
+    name: str
+    node: Node
+
+
+# Fork where we can, so that closures (like the heuristics maze.py makes)
+# and lambdas can be used as-is. Other start methods (spawn is the default
+# on macOS and Windows) have to pickle everything, so the problem objects
+# and callables must be picklable there; portfolio_tests.py checks that
+# Maze and MCState are.
+def _context() -> BaseContext:
+    return get_context("fork") if "fork" in get_all_start_methods() else get_context()
+
+
+# Runs in a worker process: search and report back which configuration
+# it was along with the path (a Node chain would be pickled link by link)
+def _run(slot: int, configuration: SearchConfig, initial: Any, goal_test: Callable[[Any], bool], successors: Callable[[Any], List[Any]], results: Any) -> None:
+    try:
+        node: Optional[Node] = configuration.search(initial, goal_test, successors, *configuration.args)
+        results.put((slot, None if node is None else node_to_path(node), None))
+    except Exception as error:  # let the parent know rather than leave it waiting
+        results.put((slot, None, error))
+
+
+# Rebuild the Node chain that the searches return from a path, with each
+# node's cost being its depth
+def path_to_node(path: List[T]) -> Node[T]:
+    node: Optional[Node[T]] = None
+    for depth, state in enumerate(path):
+        node = Node(state, node, float(depth))
+    assert node is not None  # a solution path always has at least initial
+    return node
+
+
+# Race several search configurations on the same problem, each in its own
+# process. By default the first solution found wins and the other workers
+# are stopped; with best=True every configuration runs to the end (or to
+# timeout) and the shortest path wins, ties going to the earlier
+# configuration. Returns None if nothing was found in time. Pass a
+# context (like get_context("spawn")) to pick how the workers are started.
+def portfolio_search(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], configurations: Sequence[SearchConfig], best: bool = False, timeout: Optional[float] = None, context: Optional[BaseContext] = None) -> Optional[PortfolioResult]:
+    if context is None:
+        context = _context()
+    results: Any = context.Queue()
+    workers: List[Any] = [context.Process(target=_run, args=(slot, configuration, initial, goal_test, successors, results), daemon=True)
+                          for slot, configuration in enumerate(configurations)]
+    deadline: Optional[float] = None if timeout is None else perf_counter() + timeout
+    winner: Optional[Tuple[int, List[T]]] = None
+    reported: Set[int] = set()
+    started: List[Any] = []
+    try:
+        for worker in workers:
+            worker.start()
+            started.append(worker)
+        while len(reported) < len(workers):
+            remaining: Optional[float] = None if deadline is None else deadline - perf_counter()
+            if remaining is not None and remaining <= 0:
+                break  # out of time
+            try:
+                slot, path, error = results.get(timeout=_POLL if remaining is None else min(remaining, _POLL))
+            except Empty:
+                # a worker that died without reporting (say it couldn't
+                # unpickle its problem) would otherwise be waited on forever
+                for slot, worker in enumerate(workers):
+                    if slot not in reported and worker.exitcode not in (None, 0):
+                        raise RuntimeError(f"{configurations[slot].name} worker exited with code {worker.exitcode}")
+                continue
+            reported.add(slot)
+            if error is not None:
+                raise error
+            if path is None:
+                continue  # this configuration found nothing, so wait for the others
+            if winner is None or len(path) < len(winner[1]) or (len(path) == len(winner[1]) and slot < winner[0]):
+                winner = (slot, path)
+            if not best:
+                break
+    finally:
+        # cancel whatever is still searching
+        for worker in started:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+        results.close()
+    if winner is None:
+        return None
+    return PortfolioResult(configurations[winner[0]].name, path_to_node(winner[1]))
+
+
+if __name__ == "__main__":
+    from generic_search import dfs, bfs, astar
+    from maze import Maze, MazeLocation, manhattan_distance, euclidean_distance, jump_point_search
+    from missionaries import MCState, MCStateEncoder, MAX_NUM
+
+    m: Maze = Maze(200, 200, 0.15, MazeLocation(0, 0), MazeLocation(199, 199))
+    configurations: List[SearchConfig] = [SearchConfig("dfs", dfs),
+                                          SearchConfig("bfs", bfs),
+                                          SearchConfig("astar manhattan", astar, (manhattan_distance(m.goal),)),
+                                          SearchConfig("astar euclidean", astar, (euclidean_distance(m.goal),))]
+    first: Optional[PortfolioResult] = portfolio_search(m.start, m.goal_test, m.successors, configurations)
+    if first is None:
+        print("No solution found by the portfolio!")
+    else:
+        print(f"{first.name} finished first with a path of {len(node_to_path(first.node))} locations")
+        shortest: Optional[PortfolioResult] = portfolio_search(m.start, m.goal_test, m.successors, configurations, best=True)
+        if shortest is not None:
+            print(f"{shortest.name} found the shortest path, {len(node_to_path(shortest.node))} locations")
+            jps: Optional[Node[MazeLocation]] = jump_point_search(m)
+            print(f"Jump Point Search agrees: {jps is not None and len(node_to_path(jps)) == len(node_to_path(shortest.node))}")
+
+    # MCState needs an encoder to avoid revisiting states
+    start: MCState = MCState(MAX_NUM, MAX_NUM, True)
+    crossing: Optional[PortfolioResult] = portfolio_search(start, MCState.goal_test, MCState.successors,
+                                                           [SearchConfig("dfs", dfs, (MCStateEncoder(),)),
+                                                            SearchConfig("bfs", bfs, (MCStateEncoder(),))], best=True)
+    if crossing is not None:
+        print(f"{crossing.name} crossed the river in {len(node_to_path(crossing.node)) - 1} trips")
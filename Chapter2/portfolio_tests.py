@@ -0,0 +1,53 @@
+# portfolio_tests.py
+# From Classic Computer Science Problems in Python Chapter 2
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from typing import List, Optional
+from multiprocessing import get_context, get_all_start_methods
+from multiprocessing.context import BaseContext
+from generic_search import dfs, bfs, node_to_path
+from portfolio import SearchConfig, PortfolioResult, portfolio_search
+from maze import Maze, MazeLocation, DistanceField
+from missionaries import MCState, MCStateEncoder, MAX_NUM
+
+
+# Spawned workers get everything pickled, unlike forked ones
+@unittest.skipUnless("spawn" in get_all_start_methods(), "spawn isn't available")
+class PortfolioSpawnTestCase(unittest.TestCase):
+    def setUp(self):
+        self.context: BaseContext = get_context("spawn")
+
+    def test_maze(self):
+        maze: Maze = Maze(10, 10, 0.0, MazeLocation(0, 0), MazeLocation(9, 9))
+        field: DistanceField = DistanceField(maze)  # attached fields don't travel with the maze
+        configurations: List[SearchConfig] = [SearchConfig("dfs", dfs), SearchConfig("bfs", bfs, (maze,))]
+        result: Optional[PortfolioResult] = portfolio_search(maze.start, maze.goal_test, maze.successors,
+                                                             configurations, best=True, context=self.context)
+        self.assertIsNotNone(result)
+        self.assertEqual(result.name, "bfs")
+        self.assertEqual(len(node_to_path(result.node)) - 1, field.distance(maze.start))
+
+    def test_missionaries(self):
+        configurations: List[SearchConfig] = [SearchConfig("dfs", dfs, (MCStateEncoder(),)),
+                                              SearchConfig("bfs", bfs, (MCStateEncoder(),))]
+        result: Optional[PortfolioResult] = portfolio_search(MCState(MAX_NUM, MAX_NUM, True), MCState.goal_test,
+                                                             MCState.successors, configurations, best=True,
+                                                             context=self.context)
+        self.assertIsNotNone(result)
+        self.assertEqual(len(node_to_path(result.node)) - 1, 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
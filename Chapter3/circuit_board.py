@@ -1,4 +1,4 @@
-from typing import NamedTuple, List, Dict, Optional
+from typing import NamedTuple, List, Dict, Optional, Set
 from enum import Enum
 from csp import CSP, Constraint
 
@@ -60,6 +60,20 @@ class CircuitBoardConstraint(Constraint[Chip, List[GridLocation]]):
         all_locations = [locs for values in assignment.values() for locs in values]
         return len(set(all_locations)) == len(all_locations)
 
+    # state is the set of locations covered by the chips a search has
+    # placed so far
+    def new_state(self) -> Set[GridLocation]:
+        return set()
+
+    def consistent_with(self, state: Set[GridLocation], variable: Chip, value: List[GridLocation]) -> bool:
+        return state.isdisjoint(value)
+
+    def assign(self, state: Set[GridLocation], variable: Chip, value: List[GridLocation]) -> None:
+        state.update(value)
+
+    def unassign(self, state: Set[GridLocation], variable: Chip, value: List[GridLocation]) -> None:
+        state.difference_update(value)
+
 
 if __name__ == "__main__":
     grid: Grid = generate_grid(10,10)
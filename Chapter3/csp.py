@@ -13,8 +13,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Generic, TypeVar, Dict, List, Optional
+from __future__ import annotations
+from typing import Generic, TypeVar, Dict, List, Optional, Tuple, Deque, Set, Iterator, Any
 from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import closing
+from enum import Enum
 
 V = TypeVar('V') # variable type
 D = TypeVar('D') # domain type
@@ -31,6 +35,95 @@ class Constraint(Generic[V, D], ABC):
     def satisfied(self, assignment: Dict[V, D]) -> bool:
         ...
 
+    # The incremental side of a constraint, which is what the searches use.
+    # They tell it about each variable as they assign (and unassign) it, so
+    # a new value can be checked against whatever the constraint keeps
+    # track of rather than against the whole assignment. That bookkeeping
+    # belongs to the search, not the constraint: each search asks
+    # new_state() for its own and passes it back in, so several searches
+    # (or CSPs) can share a constraint at once. assign() is only ever
+    # called with a value that consistent_with() has just accepted.
+    # These defaults keep the values assigned so far in a dict and fall
+    # back on satisfied(). A subclass can override consistent_with() alone,
+    # reading that dict, or all four to keep its own structures.
+    def new_state(self) -> Any:
+        return {}
+
+    # Could value for the (unassigned) variable still lead to a solution?
+    def consistent_with(self, state: Any, variable: V, value: D) -> bool:
+        state[variable] = value
+        consistent: bool = self.satisfied(state)
+        del state[variable]
+        return consistent
+
+    def assign(self, state: Any, variable: V, value: D) -> None:
+        state[variable] = value
+
+    def unassign(self, state: Any, variable: V, value: D) -> None:
+        del state[variable]
+
+
+# How much a search prunes the domains of the variables it hasn't
+# assigned yet after each assignment
+class Inference(Enum):
+    NONE = "none"  # only check constraints once a variable is assigned
+    FORWARD_CHECKING = "forward checking"  # prune values that conflict with the new assignment
+    MAC = "maintaining arc consistency"  # forward checking, then AC-3 on whatever that pruned
+
+
+# How a search picks the variable to assign next
+class VariableOrder(Enum):
+    DECLARATION = "declaration order"  # the first unassigned variable in the order they were given
+    MRV = "minimum remaining values"  # fewest values left, ties going to the most unassigned neighbors
+    DOM_WDEG = "dom/wdeg"  # fewest values left for the weight of its constraints, which grows as they cause dead ends
+
+
+# The order a search tries a variable's values in
+class ValueOrder(Enum):
+    DOMAIN = "domain order"  # the order of the variable's domain
+    LCV = "least constraining value"  # ruling out the fewest values of the unassigned neighbors first
+
+
+# The values still open to each variable during a propagating search.
+# Values are never copied around; each one is just marked removed, and a
+# trail of the removals lets backtracking restore them in one sweep.
+# Domain values don't need to be hashable, since they are kept by index.
+class Domains(Generic[V, D]):
+    def __init__(self, domains: Dict[V, List[D]]) -> None:
+        self._values: Dict[V, List[D]] = domains
+        self._alive: Dict[V, List[bool]] = {variable: [True] * len(values) for variable, values in domains.items()}
+        self._sizes: Dict[V, int] = {variable: len(values) for variable, values in domains.items()}
+        self._trail: List[Tuple[V, int]] = []
+
+    # The (index, value) pairs still open to variable, in domain order
+    def live(self, variable: V) -> List[Tuple[int, D]]:
+        alive: List[bool] = self._alive[variable]
+        return [(index, value) for index, value in enumerate(self._values[variable]) if alive[index]]
+
+    def size(self, variable: V) -> int:
+        return self._sizes[variable]
+
+    def remove(self, variable: V, index: int) -> None:
+        self._alive[variable][index] = False
+        self._sizes[variable] -= 1
+        self._trail.append((variable, index))
+
+    # Remove every value of variable but the one at index
+    def assign(self, variable: V, index: int) -> None:
+        for other, _ in self.live(variable):
+            if other != index:
+                self.remove(variable, other)
+
+    # A point on the trail that undo() can return to
+    def mark(self) -> int:
+        return len(self._trail)
+
+    def undo(self, mark: int) -> None:
+        while len(self._trail) > mark:
+            variable, index = self._trail.pop()
+            self._alive[variable][index] = True
+            self._sizes[variable] += 1
+
 
 # A constraint satisfaction problem consists of variables of type V
 # that have ranges of values known as domains of type D and constraints
@@ -40,6 +133,7 @@ class CSP(Generic[V, D]):
         self.variables: List[V] = variables # variables to be constrained
         self.domains: Dict[V, List[D]] = domains # domain of each variable
         self.constraints: Dict[V, List[Constraint[V, D]]] = {}
+        self.nodes_visited: int = 0  # values tried by the last search
         for variable in self.variables:
             self.constraints[variable] = []
             if variable not in self.domains:
@@ -60,23 +154,257 @@ class CSP(Generic[V, D]):
                 return False
         return True
 
-    def backtracking_search(self, assignment: Dict[V, D] = {}) -> Optional[Dict[V, D]]:
-        # assignment is complete if every variable is assigned (our base case)
-        if len(assignment) == len(self.variables):
-            return assignment
+    def backtracking_search(self, assignment: Dict[V, D] = {}, inference: Inference = Inference.NONE,
+                            variable_order: VariableOrder = VariableOrder.DECLARATION,
+                            value_order: ValueOrder = ValueOrder.DOMAIN) -> Optional[Dict[V, D]]:
+        with closing(self.iter_solutions(assignment, 1, inference, variable_order, value_order)) as solutions:
+            return next(solutions, None)
+
+    # The first of variable's constraints that rules value out, if any
+    def _rejecting(self, variable: V, value: D, state: _SearchState[V, D]) -> Optional[Constraint[V, D]]:
+        for constraint in self.constraints[variable]:
+            if not constraint.consistent_with(state.of(constraint), variable, value):
+                return constraint
+        return None
 
-        # get all variables in the CSP but not in the assignment
+    # For each variable, the other variables it shares constraints with and
+    # those constraints
+    def _neighbors(self) -> Dict[V, Dict[V, List[Constraint[V, D]]]]:
+        neighbors: Dict[V, Dict[V, List[Constraint[V, D]]]] = {variable: {} for variable in self.variables}
+        for variable in self.variables:
+            for constraint in self.constraints[variable]:
+                for other in constraint.variables:
+                    if other != variable:
+                        neighbors[variable].setdefault(other, []).append(constraint)
+        return neighbors
+
+    # Would the shared constraints still accept x_value for x with y
+    # (unassigned so far) given y_value as well?
+    @staticmethod
+    def _supports(y: V, y_value: D, x: V, x_value: D, shared: List[Constraint[V, D]], state: _SearchState[V, D]) -> bool:
+        for constraint in shared:
+            constraint.assign(state.of(constraint), y, y_value)
+        supported: bool = all(constraint.consistent_with(state.of(constraint), x, x_value) for constraint in shared)
+        for constraint in shared:
+            constraint.unassign(state.of(constraint), y, y_value)
+        return supported
+
+    # Remove the values of x that the constraints it shares with y rule
+    # out: if y is assigned, given the assignment so far; if not, because
+    # no value left to y supports them. Constraints only reject values
+    # that can't be part of a solution, so nothing needed is removed.
+    # True if any were removed.
+    def _revise(self, x: V, y: V, assignment: Dict[V, D], state: _SearchState[V, D], shared: List[Constraint[V, D]]) -> bool:
+        revised: bool = False
+        y_values: List[D] = [] if y in assignment else [y_value for _, y_value in state.domains.live(y)
+                                                        if all(constraint.consistent_with(state.of(constraint), y, y_value)
+                                                               for constraint in shared)]
+        for index, x_value in state.domains.live(x):
+            if y in assignment:
+                supported: bool = all(constraint.consistent_with(state.of(constraint), x, x_value) for constraint in shared)
+            else:
+                supported = any(self._supports(y, y_value, x, x_value, shared, state) for y_value in y_values)
+            if not supported:
+                state.domains.remove(x, index)
+                revised = True
+        return revised
+
+    # Prune the unassigned neighbors of the variables in changed, which have
+    # just lost values (or been assigned). Forward checking stops there; MAC
+    # keeps going with AC-3 until no arc can be revised. False if some
+    # variable has no values left.
+    def _propagate(self, changed: List[V], assignment: Dict[V, D], state: _SearchState[V, D], inference: Inference) -> bool:
+        arcs: Deque[Tuple[V, V]] = deque((x, y) for y in changed for x in state.neighbors[y] if x not in assignment)
+        queued: Set[Tuple[V, V]] = set(arcs)
+        while arcs:
+            x, y = arcs.popleft()
+            queued.discard((x, y))
+            if self._revise(x, y, assignment, state, state.neighbors[x][y]):
+                if state.domains.size(x) == 0:
+                    for constraint in state.neighbors[x][y]:
+                        state.bump(constraint)
+                    return False
+                if inference is Inference.MAC:
+                    for z in state.neighbors[x]:
+                        if z != y and z not in assignment and (z, x) not in queued:
+                            arcs.append((z, x))
+                            queued.add((z, x))
+        return True
+
+    def _select_variable(self, assignment: Dict[V, D], state: _SearchState[V, D], variable_order: VariableOrder) -> V:
         unassigned: List[V] = [v for v in self.variables if v not in assignment]
+        if variable_order is VariableOrder.MRV:
+            return min(unassigned, key=lambda v: (state.domains.size(v), -state.degree[v]))
+        if variable_order is VariableOrder.DOM_WDEG:
+            return min(unassigned, key=lambda v: state.domains.size(v) / max(state.wdeg[v], 1))
+        return unassigned[0]
 
-        # get the every possible domain value of the first unassigned variable
-        first: V = unassigned[0]
-        for value in self.domains[first]:
-            local_assignment = assignment.copy()
-            local_assignment[first] = value
-            # if we're still consistent, we recurse (continue)
-            if self.consistent(first, local_assignment):
-                result: Optional[Dict[V, D]] = self.backtracking_search(local_assignment)
-                # if we didn't find the result, we will end up backtracking
-                if result is not None:
-                    return result
-        return None
+    # The (index, value) pairs left to variable, in the order to try them
+    def _order_values(self, variable: V, assignment: Dict[V, D], state: _SearchState[V, D], value_order: ValueOrder) -> List[Tuple[int, D]]:
+        values: List[Tuple[int, D]] = state.domains.live(variable)
+        if value_order is ValueOrder.DOMAIN or len(values) < 2:
+            return values
+
+        # how many values of the unassigned neighbors candidate would rule
+        # out; values that are ruled out themselves go last
+        def ruled_out(candidate: Tuple[int, D]) -> Tuple[bool, int]:
+            value: D = candidate[1]
+            if self._rejecting(variable, value, state) is not None:
+                return (True, 0)
+            state.assign(variable, value)
+            count: int = 0
+            for other, shared in state.neighbors[variable].items():
+                if other not in assignment:
+                    for _, other_value in state.domains.live(other):
+                        if not all(constraint.consistent_with(state.of(constraint), other, other_value) for constraint in shared):
+                            count += 1
+            state.unassign(variable, value)
+            return (False, count)
+        return sorted(values, key=ruled_out)
+
+    # Every solution, found one at a time as they're asked for, up to limit
+    # of them (all of them if limit is None). The search keeps the domains
+    # of the unassigned variables (and, if asked, prunes them after every
+    # assignment) so that it can choose what to try next. Rather than
+    # recursing with a copy of the assignment per variable, it changes a
+    # single assignment in place and keeps a stack of the choices made,
+    # undoing the last one (and its pruning, from the trail) to backtrack;
+    # only the solutions handed out are copies.
+    def iter_solutions(self, assignment: Dict[V, D] = {}, limit: Optional[int] = None,
+                       inference: Inference = Inference.NONE,
+                       variable_order: VariableOrder = VariableOrder.DECLARATION,
+                       value_order: ValueOrder = ValueOrder.DOMAIN) -> Iterator[Dict[V, D]]:
+        self.nodes_visited = 0
+        if limit is not None and limit <= 0:
+            return
+        state: _SearchState[V, D] = _SearchState(self)
+        given: Dict[V, D] = assignment
+        assignment = {}  # the one the whole search works on
+        for variable, value in given.items():
+            indices: List[int] = [index for index, candidate in state.domains.live(variable) if candidate == value]
+            if not indices or self._rejecting(variable, value, state) is not None:
+                return
+            state.domains.assign(variable, indices[0])
+            state.assign(variable, value)
+            assignment[variable] = value
+        if inference is not Inference.NONE:
+            # MAC starts from an arc consistent problem; forward checking
+            # only needs to account for whatever was assigned up front
+            start: List[V] = self.variables if inference is Inference.MAC else list(assignment)
+            if not self._propagate(start, assignment, state, inference):
+                return
+        if len(assignment) == len(self.variables):
+            yield dict(assignment)
+            return
+
+        found: int = 0
+        stack: List[_Choice[V, D]] = [self._choose(assignment, state, variable_order, value_order)]
+        while stack:
+            choice: _Choice[V, D] = stack[-1]
+            if choice.mark is not None:  # take back the value tried last
+                state.unassign(choice.variable, assignment.pop(choice.variable))
+                state.domains.undo(choice.mark)
+                choice.mark = None
+            if choice.next == len(choice.values):  # out of values, so backtrack
+                stack.pop()
+                continue
+            index, value = choice.values[choice.next]
+            choice.next += 1
+            self.nodes_visited += 1
+            rejecting: Optional[Constraint[V, D]] = self._rejecting(choice.variable, value, state)
+            if rejecting is not None:
+                state.bump(rejecting)
+                continue
+            choice.mark = state.domains.mark()
+            state.domains.assign(choice.variable, index)
+            state.assign(choice.variable, value)
+            assignment[choice.variable] = value
+            if inference is not Inference.NONE and not self._propagate([choice.variable], assignment, state, inference):
+                continue  # undone on the next pass
+            if len(assignment) == len(self.variables):
+                yield dict(assignment)
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+                continue
+            stack.append(self._choose(assignment, state, variable_order, value_order))
+
+    def _choose(self, assignment: Dict[V, D], state: _SearchState[V, D], variable_order: VariableOrder,
+                value_order: ValueOrder) -> _Choice[V, D]:
+        variable: V = self._select_variable(assignment, state, variable_order)
+        return _Choice(variable, self._order_values(variable, assignment, state, value_order))
+
+
+# A variable on iter_solutions()'s stack: the values to try for it, how
+# many have been tried, and, while one is assigned, the trail mark to
+# undo its pruning back to
+class _Choice(Generic[V, D]):
+    def __init__(self, variable: V, values: List[Tuple[int, D]]) -> None:
+        self.variable: V = variable
+        self.values: List[Tuple[int, D]] = values
+        self.next: int = 0
+        self.mark: Optional[int] = None
+
+
+# The bookkeeping of one search, kept up to date as variables are assigned
+# and unassigned so that choosing the next variable never has to rescan
+# the constraints
+class _SearchState(Generic[V, D]):
+    def __init__(self, csp: CSP[V, D]) -> None:
+        self.domains: Domains[V, D] = Domains(csp.domains)
+        self.neighbors: Dict[V, Dict[V, List[Constraint[V, D]]]] = csp._neighbors()
+        self._constraints: Dict[V, List[Constraint[V, D]]] = csp.constraints
+        # each constraint's incremental bookkeeping for this search alone
+        self._states: Dict[Constraint[V, D], Any] = {constraint: constraint.new_state()
+                                                     for constraints in csp.constraints.values()
+                                                     for constraint in constraints}
+        # how many unassigned variables each variable shares a constraint with
+        self.degree: Dict[V, int] = {variable: len(others) for variable, others in self.neighbors.items()}
+        # for dom/wdeg, every constraint starts with a weight of 1; wdeg is
+        # the total weight of a variable's constraints that have at least
+        # two unassigned variables, so for an unassigned variable they are
+        # the constraints that it still shares with another one
+        self._weights: Dict[Constraint[V, D], int] = {}
+        self._unassigned: Dict[Constraint[V, D], int] = {}
+        for constraints in csp.constraints.values():
+            for constraint in constraints:
+                self._weights[constraint] = 1
+                self._unassigned[constraint] = len(constraint.variables)
+        self.wdeg: Dict[V, int] = {variable: sum(self._weights[constraint] for constraint in constraints
+                                                 if self._unassigned[constraint] >= 2)
+                                   for variable, constraints in csp.constraints.items()}
+
+    # What to pass constraint's incremental methods during this search
+    def of(self, constraint: Constraint[V, D]) -> Any:
+        return self._states[constraint]
+
+    def assign(self, variable: V, value: D) -> None:
+        for constraint in self._constraints[variable]:
+            constraint.assign(self._states[constraint], variable, value)
+        for other in self.neighbors[variable]:
+            self.degree[other] -= 1
+        for constraint in self._constraints[variable]:
+            if self._unassigned[constraint] == 2:
+                for other in constraint.variables:
+                    self.wdeg[other] -= self._weights[constraint]
+            self._unassigned[constraint] -= 1
+
+    # Exactly undoes assign(variable, value)
+    def unassign(self, variable: V, value: D) -> None:
+        for constraint in self._constraints[variable]:
+            self._unassigned[constraint] += 1
+            if self._unassigned[constraint] == 2:
+                for other in constraint.variables:
+                    self.wdeg[other] += self._weights[constraint]
+        for other in self.neighbors[variable]:
+            self.degree[other] += 1
+        for constraint in self._constraints[variable]:
+            constraint.unassign(self._states[constraint], variable, value)
+
+    # constraint has just caused a dead end; unlike everything else here,
+    # its extra weight stays when the search backtracks
+    def bump(self, constraint: Constraint[V, D]) -> None:
+        self._weights[constraint] += 1
+        if self._unassigned[constraint] >= 2:
+            for other in constraint.variables:
+                self.wdeg[other] += 1
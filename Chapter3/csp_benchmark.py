@@ -0,0 +1,127 @@
+# csp_benchmark.py
+# From Classic Computer Science Problems in Python Chapter 3
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import NamedTuple, Callable, Dict, List, Any
+from random import seed
+from time import perf_counter
+from csp import CSP, Inference, VariableOrder, ValueOrder
+from queens import QueensConstraint
+from map_coloring import MapColoringConstraint
+from send_more_money import SendMoreMoneyConstraint
+import sudoku
+import word_search
+import circuit_board
+
+# a puzzle easy enough for declaration order to finish in reasonable time
+SUDOKU_PUZZLE: str = "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+
+
+# One way of ordering the search; every strategy forward checks, since
+# choosing variables by their remaining values means little without pruning
+class Strategy(NamedTuple):
+    name: str
+    variable_order: VariableOrder
+    value_order: ValueOrder
+    inference: Inference = Inference.FORWARD_CHECKING
+
+
+STRATEGIES: List[Strategy] = [Strategy("declaration order", VariableOrder.DECLARATION, ValueOrder.DOMAIN),
+                              Strategy("MRV + degree", VariableOrder.MRV, ValueOrder.DOMAIN),
+                              Strategy("MRV + degree, LCV", VariableOrder.MRV, ValueOrder.LCV),
+                              Strategy("dom/wdeg", VariableOrder.DOM_WDEG, ValueOrder.DOMAIN),
+                              Strategy("dom/wdeg, LCV", VariableOrder.DOM_WDEG, ValueOrder.LCV)]
+
+
+def queens_csp(size: int) -> CSP[int, int]:
+    columns: List[int] = list(range(1, size + 1))
+    csp: CSP[int, int] = CSP(columns, {column: list(range(1, size + 1)) for column in columns})
+    csp.add_constraint(QueensConstraint(columns))
+    return csp
+
+
+def australia_csp() -> CSP[str, str]:
+    variables: List[str] = ["Western Australia", "Northern Territory", "South Australia",
+                            "Queensland", "New South Wales", "Victoria", "Tasmania"]
+    csp: CSP[str, str] = CSP(variables, {variable: ["red", "green", "blue"] for variable in variables})
+    for place1, place2 in [("Western Australia", "Northern Territory"), ("Western Australia", "South Australia"),
+                           ("South Australia", "Northern Territory"), ("Queensland", "Northern Territory"),
+                           ("Queensland", "South Australia"), ("Queensland", "New South Wales"),
+                           ("New South Wales", "South Australia"), ("Victoria", "South Australia"),
+                           ("Victoria", "New South Wales"), ("Victoria", "Tasmania")]:
+        csp.add_constraint(MapColoringConstraint(place1, place2))
+    return csp
+
+
+def send_more_money_csp() -> CSP[str, int]:
+    letters: List[str] = ["S", "E", "N", "D", "M", "O", "R", "Y"]
+    possible_digits: Dict[str, List[int]] = {letter: list(range(10)) for letter in letters}
+    possible_digits["M"] = [1]  # so we don't get answers starting with a 0
+    csp: CSP[str, int] = CSP(letters, possible_digits)
+    csp.add_constraint(SendMoreMoneyConstraint(letters))
+    return csp
+
+
+# puzzle lists the cells row by row, with a . for each empty one
+def sudoku_csp(puzzle: str) -> CSP[sudoku.GridLocation, sudoku.SudokuNumber]:
+    all_locs: List[sudoku.GridLocation] = [sudoku.GridLocation(row, col) for row in range(sudoku.NINE) for col in range(sudoku.NINE)]
+    sudoku.Sudoku.starting_numbers.clear()
+    for loc, cell in zip(all_locs, puzzle):
+        if cell != ".":
+            sudoku.Sudoku.starting_numbers[loc] = sudoku.SudokuNumber(int(cell))
+    csp: CSP[sudoku.GridLocation, sudoku.SudokuNumber] = CSP(all_locs, {loc: list(sudoku.SudokuNumber) for loc in all_locs})
+    csp.add_constraint(sudoku.SudokuConstraint(all_locs))
+    return csp
+
+
+def word_search_csp() -> CSP[str, Any]:
+    seed(2018)  # the same random grid every run
+    grid: word_search.Grid = word_search.generate_grid(9, 9)
+    words: List[str] = ["MATTHEW", "JOE", "MARY", "SARAH", "SALLY", "DAVID", "KOPEC"]
+    csp: CSP[str, Any] = CSP(words, {word: word_search.generate_domain(word, grid) for word in words})
+    csp.add_constraint(word_search.WordSearchConstraint(words))
+    return csp
+
+
+def circuit_board_csp() -> CSP[circuit_board.Chip, Any]:
+    grid: circuit_board.Grid = circuit_board.generate_grid(10, 10)
+    chips: List[circuit_board.Chip] = [circuit_board.Chip(1, 6, circuit_board.ChipColor.BLUE),
+                                       circuit_board.Chip(3, 4, circuit_board.ChipColor.GREEN),
+                                       circuit_board.Chip(5, 5, circuit_board.ChipColor.PURPLE),
+                                       circuit_board.Chip(2, 8, circuit_board.ChipColor.RED),
+                                       circuit_board.Chip(3, 3, circuit_board.ChipColor.YELLOW)]
+    csp: CSP[circuit_board.Chip, Any] = CSP(chips, {chip: circuit_board.generate_domain(chip, grid) for chip in chips})
+    csp.add_constraint(circuit_board.CircuitBoardConstraint(chips))
+    return csp
+
+
+# Each problem is built fresh for every strategy
+PROBLEMS: Dict[str, Callable[[], CSP]] = {"16 queens": lambda: queens_csp(16),
+                                          "Australia": australia_csp,
+                                          "SEND+MORE=MONEY": send_more_money_csp,
+                                          "sudoku": lambda: sudoku_csp(SUDOKU_PUZZLE),
+                                          "word search": word_search_csp,
+                                          "circuit board": circuit_board_csp}
+
+
+if __name__ == "__main__":
+    print(f"{'problem':<16} {'strategy':<20} {'nodes':>8} {'seconds':>8}")
+    for problem, build in PROBLEMS.items():
+        for strategy in STRATEGIES:
+            csp: CSP = build()
+            start: float = perf_counter()
+            solution = csp.backtracking_search(inference=strategy.inference, variable_order=strategy.variable_order,
+                                               value_order=strategy.value_order)
+            elapsed: float = perf_counter() - start
+            print(f"{problem:<16} {strategy.name:<20} {csp.nodes_visited:>8} {elapsed:>8.3f}{'' if solution else ' (no solution)'}")
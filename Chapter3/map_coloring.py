@@ -32,6 +32,12 @@ class MapColoringConstraint(Constraint[str, str]):
         # color assigned to place2
         return assignment[self.place1] != assignment[self.place2]
 
+    # only the other place's color matters; state is the colors assigned
+    # so far, kept by the default assign() and unassign()
+    def consistent_with(self, state: Dict[str, str], variable: str, value: str) -> bool:
+        other: str = self.place2 if variable == self.place1 else self.place1
+        return other not in state or state[other] != value
+
 
 if __name__ == "__main__":
     variables: List[str] = ["Western Australia", "Northern Territory", "South Australia",
@@ -13,8 +13,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from csp import Constraint, CSP
-from typing import Dict, List, Optional
+from csp import Constraint, CSP, Inference
+from typing import Dict, List, Optional, Set, NamedTuple, Iterator
+from itertools import combinations
+
+
+# The rows and both kinds of diagonal taken by the queens a search has
+# placed so far
+class QueensState(NamedTuple):
+    rows: Set[int]
+    diagonals: Set[int]  # row - column is the same along one
+    antidiagonals: Set[int]  # row + column along the other
 
 
 class QueensConstraint(Constraint[int, int]):
@@ -23,18 +32,33 @@ class QueensConstraint(Constraint[int, int]):
         self.columns: List[int] = columns
 
     def satisfied(self, assignment: Dict[int, int]) -> bool:
-        # q1c = queen 1 column, q1r = queen 1 row
-        for q1c, q1r in assignment.items():
-            # q2c = queen 2 column
-            for q2c in range(q1c + 1, len(self.columns) + 1):
-                if q2c in assignment:
-                    q2r: int = assignment[q2c] # q2r = queen 2 row
-                    if q1r == q2r: # same row?
-                        return False
-                    if abs(q1r - q2r) == abs(q1c - q2c): # same diagonal?
-                        return False
+        # q1c = queen 1 column, q1r = queen 1 row, q2c = queen 2 column,
+        # q2r = queen 2 row; only queens that have been placed are compared,
+        # so checking a couple of them is cheap however big the board is
+        for (q1c, q1r), (q2c, q2r) in combinations(assignment.items(), 2):
+            if q1r == q2r:  # same row?
+                return False
+            if abs(q1r - q2r) == abs(q1c - q2c):  # same diagonal?
+                return False
         return True # no conflict
 
+    def new_state(self) -> QueensState:
+        return QueensState(set(), set(), set())
+
+    def consistent_with(self, state: QueensState, variable: int, value: int) -> bool:
+        return (value not in state.rows and value - variable not in state.diagonals and
+                value + variable not in state.antidiagonals)
+
+    def assign(self, state: QueensState, variable: int, value: int) -> None:
+        state.rows.add(value)
+        state.diagonals.add(value - variable)
+        state.antidiagonals.add(value + variable)
+
+    def unassign(self, state: QueensState, variable: int, value: int) -> None:
+        state.rows.remove(value)
+        state.diagonals.remove(value - variable)
+        state.antidiagonals.remove(value + variable)
+
 
 if __name__ == "__main__":
     columns: List[int] = [1, 2, 3, 4, 5, 6, 7, 8]
@@ -47,4 +71,15 @@ if __name__ == "__main__":
     if solution is None:
         print("No solution found!")
     else:
-        print(solution)
\ No newline at end of file
+        print(solution)
+    # pruning finds the same solution, visiting far fewer dead ends
+    for inference in (Inference.FORWARD_CHECKING, Inference.MAC):
+        print(f"{inference.value}: {csp.backtracking_search(inference=inference) == solution}")
+    # every solution, generated lazily without recursion
+    print(f"{sum(1 for _ in csp.iter_solutions())} solutions in all")
+    # each search keeps its own bookkeeping, so searches of the same CSP
+    # can run interleaved
+    first_two: Iterator[Dict[int, int]] = csp.iter_solutions(limit=2)
+    agree: bool = next(first_two) == csp.backtracking_search()
+    agree = agree and all(sum(1 for _ in csp.iter_solutions()) == 92 for _ in first_two)
+    print(f"interleaved searches agree: {agree}")
@@ -14,7 +14,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from csp import Constraint, CSP
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, NamedTuple
+
+
+# The letters a search has assigned so far and the digits they use
+class SendMoreMoneyState(NamedTuple):
+    assignment: Dict[str, int]
+    digits: Set[int]
 
 
 class SendMoreMoneyConstraint(Constraint[str, int]):
@@ -43,6 +49,25 @@ class SendMoreMoneyConstraint(Constraint[str, int]):
             return send + more == money
         return True # no conflict
 
+    def new_state(self) -> SendMoreMoneyState:
+        return SendMoreMoneyState({}, set())
+
+    def consistent_with(self, state: SendMoreMoneyState, variable: str, value: int) -> bool:
+        if value in state.digits:
+            return False
+        # the sum can only be checked with the last letter
+        if len(state.assignment) + 1 == len(self.letters):
+            return self.satisfied({**state.assignment, variable: value})
+        return True
+
+    def assign(self, state: SendMoreMoneyState, variable: str, value: int) -> None:
+        state.assignment[variable] = value
+        state.digits.add(value)
+
+    def unassign(self, state: SendMoreMoneyState, variable: str, value: int) -> None:
+        del state.assignment[variable]
+        state.digits.remove(value)
+
 
 if __name__ == "__main__":
     letters: List[str] = ["S", "E", "N", "D", "M", "O", "R", "Y"]
@@ -1,7 +1,5 @@
-from nntplib import GroupInfo
-from re import S
 from typing import NamedTuple, List, Dict, Optional, Tuple
-from csp import CSP, Constraint
+from csp import CSP, Constraint, Inference
 from enum import Enum
 from itertools import combinations
 
@@ -61,9 +59,7 @@ class Sudoku:
         for i, row in enumerate(self.grid):
             if i != ZERO and i % THREE == ZERO:
                 print("------+-------+------")
-            row.insert(SIX, '|')
-            row.insert(THREE, '|')
-            print(" ".join(row))
+            print(" ".join(row[:THREE] + ['|'] + row[THREE:SIX] + ['|'] + row[SIX:]))
 
     def add_starting_number(self, loc: GridLocation, number: SudokuNumber) -> None:
         self.starting_numbers[loc] = number
@@ -81,22 +77,55 @@ def get_connected_grid_locations(all_locs: List[GridLocation], loc: GridLocation
     return connected_locs
 
 
+# For each row, column and square, a bit per number for the numbers a
+# search has placed there so far
+class SudokuState(NamedTuple):
+    rows: List[int]
+    columns: List[int]
+    squares: List[int]
+
+
 class SudokuConstraint(Constraint[GridLocation, SudokuNumber]):
     def __init__(self, grid_locations: List[GridLocation]) -> None:
         super().__init__(grid_locations)
         self.grid_locations: List[GridLocation] = grid_locations
+        # which locations share a row, column or square is worked out once
+        # here rather than on every check
+        self.connected: Dict[GridLocation, List[GridLocation]] = {loc: get_connected_grid_locations(grid_locations, loc)
+                                                                  for loc in grid_locations}
 
-    def satisfied(self, assignment: Dict[GridLocation, SudokuNumber]) -> bool:        
-        all_locs: List[GridLocation] = [GridLocation(row, col) for row in range(NINE) for col in range(NINE)]
+    def satisfied(self, assignment: Dict[GridLocation, SudokuNumber]) -> bool:
         for loc, number in assignment.items():
-            connected_locs: List[GridLocation] = get_connected_grid_locations(all_locs, loc)
-            if loc in Sudoku.starting_numbers and assignment[loc] != sudoku.starting_numbers[loc]:
+            if loc in Sudoku.starting_numbers and number != Sudoku.starting_numbers[loc]:
                 return False
-            for loc in connected_locs:
-                if loc in assignment and assignment[loc] == number:
+            for other_loc in self.connected[loc]:
+                if other_loc in assignment and assignment[other_loc] == number:
                     return False
         return True
 
+    @staticmethod
+    def square(loc: GridLocation) -> int:
+        return loc.row // THREE * THREE + loc.column // THREE
+
+    def new_state(self) -> SudokuState:
+        return SudokuState([0] * NINE, [0] * NINE, [0] * NINE)
+
+    def consistent_with(self, state: SudokuState, variable: GridLocation, value: SudokuNumber) -> bool:
+        if variable in Sudoku.starting_numbers and value != Sudoku.starting_numbers[variable]:
+            return False
+        taken: int = state.rows[variable.row] | state.columns[variable.column] | state.squares[self.square(variable)]
+        return not taken & 1 << value.value
+
+    def assign(self, state: SudokuState, variable: GridLocation, value: SudokuNumber) -> None:
+        state.rows[variable.row] |= 1 << value.value
+        state.columns[variable.column] |= 1 << value.value
+        state.squares[self.square(variable)] |= 1 << value.value
+
+    def unassign(self, state: SudokuState, variable: GridLocation, value: SudokuNumber) -> None:
+        state.rows[variable.row] &= ~(1 << value.value)
+        state.columns[variable.column] &= ~(1 << value.value)
+        state.squares[self.square(variable)] &= ~(1 << value.value)
+
 
 if __name__ == "__main__":
     sudoku: Sudoku = Sudoku()
@@ -108,7 +137,7 @@ if __name__ == "__main__":
         numbers[loc] = [number for number in SudokuNumber]
     csp: CSP[GridLocation, SudokuNumber] = CSP(all_locs, numbers)
     csp.add_constraint(SudokuConstraint(all_locs))
-    solution: Optional[Dict[GridLocation, SudokuNumber]] = csp.backtracking_search()
+    solution: Optional[Dict[GridLocation, SudokuNumber]] = csp.backtracking_search(inference=Inference.MAC)
     if solution is None:
         print("No solution found!")
     else:
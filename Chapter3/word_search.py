@@ -67,6 +67,13 @@ def generate_domain(word: str, grid: Grid) -> List[List[Tuple[str, GridLocation]
     return domain
 
 
+# The letter in each location the words a search has placed so far cover,
+# and how many of those words cover it
+class WordSearchState(NamedTuple):
+    letters: Dict[GridLocation, str]
+    covering: Dict[GridLocation, int]
+
+
 class WordSearchConstraint(Constraint[str, List[Tuple[str, GridLocation]]]):
     def __init__(self, words: List[str]) -> None:
         super().__init__(words)
@@ -84,6 +91,25 @@ class WordSearchConstraint(Constraint[str, List[Tuple[str, GridLocation]]]):
                 all_lettered_locations.add((letter, loc))
         return True
 
+    def new_state(self) -> WordSearchState:
+        return WordSearchState({}, {})
+
+    # words may cross, but only where they share a letter
+    def consistent_with(self, state: WordSearchState, variable: str, value: List[Tuple[str, GridLocation]]) -> bool:
+        return all(state.letters.get(loc, letter) == letter for letter, loc in value)
+
+    def assign(self, state: WordSearchState, variable: str, value: List[Tuple[str, GridLocation]]) -> None:
+        for letter, loc in value:
+            state.letters[loc] = letter
+            state.covering[loc] = state.covering.get(loc, 0) + 1
+
+    def unassign(self, state: WordSearchState, variable: str, value: List[Tuple[str, GridLocation]]) -> None:
+        for letter, loc in value:
+            state.covering[loc] -= 1
+            if state.covering[loc] == 0:
+                del state.covering[loc]
+                del state.letters[loc]
+
 if __name__ == "__main__":
     grid: Grid = generate_grid(4, 9)
     words: List[str] = ["MATTHEW", "JOE", "MARY", "SARAH", "SALLY"]
@@ -0,0 +1,163 @@
+# all_pairs.py
+# From Classic Computer Science Problems in Python Chapter 4
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import TypeVar, List, Tuple, Optional, Union
+from array import array
+from heapq import heappush, heappop
+from itertools import repeat
+from multiprocessing import Pool
+from weighted_graph import WeightedGraph
+from csr_graph import WeightedCSRGraph
+
+V = TypeVar('V')  # type of the vertices in the graph
+INFINITY: float = float("inf")  # distance between vertices that can't reach each other
+
+
+# A size x size grid of distances packed row by row into one array of doubles
+class DistanceMatrix:
+    def __init__(self, size: int, values: array) -> None:
+        self._size: int = size
+        self._values: array = values
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    # matrix[u, v] is the distance from vertex index u to vertex index v
+    def __getitem__(self, key: Tuple[int, int]) -> float:
+        u, v = key
+        return self._values[u * self._size + v]
+
+    # All distances from vertex index u (a view, not a copy)
+    def row(self, u: int) -> memoryview:
+        return memoryview(self._values)[u * self._size:(u + 1) * self._size]
+
+    def __str__(self) -> str:
+        return "\n".join(" ".join(f"{distance:g}" for distance in self.row(u)) for u in range(self._size))
+
+
+# The graph each worker process searches, set once by _set_snapshot()
+# rather than sent along with every source
+_snapshot: Optional[WeightedCSRGraph] = None
+
+
+def _set_snapshot(snapshot: WeightedCSRGraph) -> None:
+    global _snapshot
+    _snapshot = snapshot
+
+
+# Dijkstra's algorithm from source over the snapshot's flat arrays,
+# returning a whole row of the distance matrix
+def _distances_from(source: int) -> array:
+    assert _snapshot is not None  # set up by _set_snapshot()
+    graph: WeightedCSRGraph = _snapshot
+    distances: array = array('d', repeat(INFINITY, graph.vertex_count))
+    distances[source] = 0.0
+    pq: List[Tuple[float, int]] = [(0.0, source)]
+    while pq:
+        dist_u, u = heappop(pq)
+        if dist_u > distances[u]:
+            continue  # stale entry, u was already settled closer
+        for v, weight in zip(graph.neighbor_indices_for_index(u), graph.weights_for_index(u)):
+            if dist_u + weight < distances[v]:
+                distances[v] = dist_u + weight
+                heappush(pq, (dist_u + weight, v))
+    return distances
+
+
+# Shortest distances between every pair of vertices, from one Dijkstra run
+# per source. The runs are spread over a pool of processes (processes=None
+# uses one per CPU, processes=1 stays in this process), each of which
+# gets its own copy of a read-only CSR snapshot of the graph up front.
+def all_pairs_dijkstra(wg: Union[WeightedGraph[V], WeightedCSRGraph[V]], processes: Optional[int] = None) -> DistanceMatrix:
+    snapshot: WeightedCSRGraph[V] = wg if isinstance(wg, WeightedCSRGraph) else WeightedCSRGraph(wg)
+    size: int = snapshot.vertex_count
+    rows: List[array]
+    if processes == 1:
+        _set_snapshot(snapshot)
+        rows = [_distances_from(source) for source in range(size)]
+    else:
+        with Pool(processes, initializer=_set_snapshot, initargs=(snapshot,)) as pool:
+            rows = pool.map(_distances_from, range(size), chunksize=max(1, size // 64))
+    values: array = array('d')
+    for row in rows:
+        values.extend(row)
+    return DistanceMatrix(size, values)
+
+
+# Floyd-Warshall for small, dense graphs. NumPy isn't a dependency of this
+# code, so the inner loop over j relaxes a whole row at once in a single
+# comprehension over zip() rather than indexing cell by cell.
+def floyd_warshall(wg: Union[WeightedGraph[V], WeightedCSRGraph[V]]) -> DistanceMatrix:
+    size: int = wg.vertex_count
+    rows: List[List[float]] = [[INFINITY] * size for _ in range(size)]
+    for u in range(size):
+        rows[u][u] = 0.0
+        for edge in wg.edges_for_index(u):
+            if edge.weight < rows[u][edge.v]:  # keep the cheapest parallel edge
+                rows[u][edge.v] = edge.weight
+    for k in range(size):
+        row_k: List[float] = rows[k]
+        for i in range(size):
+            dist_ik: float = rows[i][k]
+            if i == k or dist_ik == INFINITY:
+                continue  # going through k can't help
+            rows[i] = [dist_ij if dist_ij < dist_ik + dist_kj else dist_ik + dist_kj
+                       for dist_ij, dist_kj in zip(rows[i], row_k)]
+    values: array = array('d')
+    for row in rows:
+        values.extend(row)
+    return DistanceMatrix(size, values)
+
+
+if __name__ == "__main__":
+    from dijkstra import dijkstra
+
+    city_graph2: WeightedGraph[str] = WeightedGraph(["Seattle", "San Francisco", "Los Angeles", "Riverside", "Phoenix", "Chicago", "Boston", "New York", "Atlanta", "Miami", "Dallas", "Houston", "Detroit", "Philadelphia", "Washington"])
+
+    city_graph2.add_edge_by_vertices("Seattle", "Chicago", 1737)
+    city_graph2.add_edge_by_vertices("Seattle", "San Francisco", 678)
+    city_graph2.add_edge_by_vertices("San Francisco", "Riverside", 386)
+    city_graph2.add_edge_by_vertices("San Francisco", "Los Angeles", 348)
+    city_graph2.add_edge_by_vertices("Los Angeles", "Riverside", 50)
+    city_graph2.add_edge_by_vertices("Los Angeles", "Phoenix", 357)
+    city_graph2.add_edge_by_vertices("Riverside", "Phoenix", 307)
+    city_graph2.add_edge_by_vertices("Riverside", "Chicago", 1704)
+    city_graph2.add_edge_by_vertices("Phoenix", "Dallas", 887)
+    city_graph2.add_edge_by_vertices("Phoenix", "Houston", 1015)
+    city_graph2.add_edge_by_vertices("Dallas", "Chicago", 805)
+    city_graph2.add_edge_by_vertices("Dallas", "Atlanta", 721)
+    city_graph2.add_edge_by_vertices("Dallas", "Houston", 225)
+    city_graph2.add_edge_by_vertices("Houston", "Atlanta", 702)
+    city_graph2.add_edge_by_vertices("Houston", "Miami", 968)
+    city_graph2.add_edge_by_vertices("Atlanta", "Chicago", 588)
+    city_graph2.add_edge_by_vertices("Atlanta", "Washington", 543)
+    city_graph2.add_edge_by_vertices("Atlanta", "Miami", 604)
+    city_graph2.add_edge_by_vertices("Miami", "Washington", 923)
+    city_graph2.add_edge_by_vertices("Chicago", "Detroit", 238)
+    city_graph2.add_edge_by_vertices("Detroit", "Boston", 613)
+    city_graph2.add_edge_by_vertices("Detroit", "Washington", 396)
+    city_graph2.add_edge_by_vertices("Detroit", "New York", 482)
+    city_graph2.add_edge_by_vertices("Boston", "New York", 190)
+    city_graph2.add_edge_by_vertices("New York", "Philadelphia", 81)
+    city_graph2.add_edge_by_vertices("Philadelphia", "Washington", 123)
+
+    matrix: DistanceMatrix = all_pairs_dijkstra(city_graph2)
+    print(matrix)
+    # both engines should agree with running dijkstra from every city
+    print(str(floyd_warshall(city_graph2)) == str(matrix))
+    print(all(dijkstra(city_graph2, city_graph2.vertex_at(u))[0] == list(matrix.row(u))
+              for u in range(city_graph2.vertex_count)))
+    print(f"Seattle to Miami: {matrix[city_graph2.index_of('Seattle'), city_graph2.index_of('Miami')]}")
@@ -0,0 +1,401 @@
+# contraction_hierarchy.py
+# From Classic Computer Science Problems in Python Chapter 4
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+from typing import TypeVar, Generic, List, Dict, Tuple, Optional, Any
+from array import array
+from heapq import heappush, heappop
+import json
+from weighted_graph import WeightedGraph
+from weighted_edge import WeightedEdge
+from mst import WeightedPath
+
+V = TypeVar('V')  # type of the vertices in the graph
+Pair = Tuple[int, int]  # two vertex indices, lower index first
+
+
+def _pair(u: int, v: int) -> Pair:
+    return (u, v) if u < v else (v, u)
+
+
+# JSON turns tuples into lists, so turn them back to keep vertices hashable
+def _from_json(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_from_json(item) for item in value)
+    return value
+
+
+# A contraction hierarchy answers point-to-point shortest path queries on a
+# WeightedGraph that doesn't change. Preprocessing removes ("contracts") the
+# vertices one at a time, least important first, adding a shortcut edge
+# wherever that removal would have lengthened a shortest path. A query then
+# only has to search upward (toward more important vertices) from both
+# ends, which touches a tiny part of the graph.
+class ContractionHierarchy(Generic[V]):
+    # witness_limit bounds how many vertices each witness search may settle;
+    # a lower limit preprocesses faster but may add unneeded shortcuts
+    def __init__(self, wg: WeightedGraph[V], witness_limit: int = 50) -> None:
+        size: int = wg.vertex_count
+        self._vertices: List[V] = [wg.vertex_at(i) for i in range(size)]
+        self._indices: Dict[V, int] = {}
+        for index, vertex in enumerate(self._vertices):
+            if not wg.is_removed(index):
+                self._indices.setdefault(vertex, index)
+        self._weights: Dict[Pair, float] = {}  # every edge in the hierarchy
+        self._middles: Dict[Pair, int] = {}  # the vertex each shortcut bypasses
+        # the graph that is still left to contract, keeping only the
+        # cheapest of any parallel edges and dropping self-loops
+        remaining: List[Dict[int, float]] = [{} for _ in range(size)]
+        for u in range(size):
+            for edge in wg.edges_for_index(u):
+                if edge.u != edge.v and (edge.v not in remaining[u] or edge.weight < remaining[u][edge.v]):
+                    remaining[u][edge.v] = edge.weight
+                    self._weights[_pair(edge.u, edge.v)] = edge.weight
+        self._contract_all(remaining, witness_limit)
+
+    def _contract_all(self, remaining: List[Dict[int, float]], witness_limit: int) -> None:
+        size: int = len(remaining)
+        upward: List[List[Tuple[int, float]]] = [[] for _ in range(size)]
+        contracted_neighbors: List[int] = [0] * size
+
+        # Cheaper to contract first: vertices that add few shortcuts compared
+        # to the edges they remove, and whose neighbors haven't lost many vertices
+        def priority(v: int, shortcuts: List[Tuple[int, int, float]]) -> int:
+            return len(shortcuts) - len(remaining[v]) + contracted_neighbors[v]
+
+        pq: List[Tuple[int, int]] = [(priority(v, self._shortcuts(remaining, v, witness_limit)), v) for v in range(size)]
+        pq.sort()
+        while pq:
+            _, v = heappop(pq)
+            # priorities go stale as neighbors get contracted, so
+            # recheck this one against the next best before using it
+            shortcuts: List[Tuple[int, int, float]] = self._shortcuts(remaining, v, witness_limit)
+            current: int = priority(v, shortcuts)
+            if pq and current > pq[0][0]:
+                heappush(pq, (current, v))
+                continue
+            for u, w, weight in shortcuts:
+                remaining[u][w] = weight
+                remaining[w][u] = weight
+                self._weights[_pair(u, w)] = weight
+                self._middles[_pair(u, w)] = v
+            # everything still next to v is contracted later, so ranks above it
+            for u, weight in remaining[v].items():
+                upward[v].append((u, weight))
+                del remaining[u][v]
+                contracted_neighbors[u] += 1
+            remaining[v] = {}
+
+        # pack the upward edges into compressed-sparse-row arrays
+        self._offsets: array = array('l', [0])
+        self._targets: array = array('i')
+        self._up_weights: array = array('d')
+        for edges in upward:
+            for u, weight in edges:
+                self._targets.append(u)
+                self._up_weights.append(weight)
+            self._offsets.append(len(self._targets))
+
+    # The shortcuts needed to contract v: for each pair of its neighbors u and
+    # w, one is needed unless a "witness" path avoiding v is just as short
+    @staticmethod
+    def _shortcuts(remaining: List[Dict[int, float]], v: int, witness_limit: int) -> List[Tuple[int, int, float]]:
+        shortcuts: List[Tuple[int, int, float]] = []
+        neighbors: List[Tuple[int, float]] = list(remaining[v].items())
+        for i, (u, weight_uv) in enumerate(neighbors):
+            targets: Dict[int, float] = {w: weight_uv + weight_vw for w, weight_vw in neighbors[i + 1:]}
+            if not targets:
+                continue
+            limit: float = max(targets.values())
+            # Dijkstra from u that never enters v and gives up early
+            distances: Dict[int, float] = {u: 0.0}
+            pq: List[Tuple[float, int]] = [(0.0, u)]
+            settled: int = 0
+            unsettled: int = len(targets)  # targets whose distance isn't final yet
+            while pq and settled < witness_limit and unsettled:
+                dist_x, x = heappop(pq)
+                if dist_x > distances[x]:
+                    continue  # stale entry
+                if dist_x > limit:
+                    break  # too far to be a witness for anything
+                settled += 1
+                if x in targets:
+                    unsettled -= 1
+                for y, weight in remaining[x].items():
+                    if y != v and (y not in distances or dist_x + weight < distances[y]):
+                        distances[y] = dist_x + weight
+                        heappush(pq, (dist_x + weight, y))
+            for w, via in targets.items():
+                if w not in distances or distances[w] > via:
+                    shortcuts.append((u, w, via))
+        return shortcuts
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self._vertices)  # Number of vertices
+
+    # Find the vertex at a specific index
+    def vertex_at(self, index: int) -> V:
+        return self._vertices[index]
+
+    # Find the index of a vertex in the hierarchy
+    def index_of(self, vertex: V) -> int:
+        try:
+            return self._indices[vertex]
+        except KeyError:
+            raise ValueError(f"{vertex!r} is not in graph") from None
+
+    # Bidirectional Dijkstra that only ever follows edges up the hierarchy.
+    # Returns the shortest distance and the vertex at the top of that path,
+    # plus the parent of each vertex each side reached.
+    def _search(self, first: int, last: int) -> Tuple[Optional[float], int, Dict[int, int], Dict[int, int]]:
+        offsets: array = self._offsets
+        targets: array = self._targets
+        weights: array = self._up_weights
+        distances: Tuple[Dict[int, float], Dict[int, float]] = ({first: 0.0}, {last: 0.0})
+        parents: Tuple[Dict[int, int], Dict[int, int]] = ({}, {})
+        pqs: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0.0, first)], [(0.0, last)])
+        best: Optional[float] = None
+        top: int = -1
+        side: int = 0
+        while pqs[0] or pqs[1]:
+            if not pqs[side]:
+                side = 1 - side
+            pq: List[Tuple[float, int]] = pqs[side]
+            dist_u, u = heappop(pq)
+            mine: Dict[int, float] = distances[side]
+            if dist_u > mine[u]:
+                continue  # stale entry
+            if best is not None and dist_u >= best:
+                pq.clear()  # nothing further up this side can help
+                continue
+            other: Dict[int, float] = distances[1 - side]
+            if u in other and (best is None or dist_u + other[u] < best):
+                best = dist_u + other[u]
+                top = u
+            # stall-on-demand: if a vertex above u already reaches it more
+            # cheaply, u can't be on a shortest path, so don't expand it
+            stalled: bool = False
+            for i in range(offsets[u], offsets[u + 1]):
+                v: int = targets[i]
+                if v in mine and mine[v] + weights[i] < dist_u:
+                    stalled = True
+                    break
+            if stalled:
+                side = 1 - side
+                continue
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if v not in mine or dist_u + weights[i] < mine[v]:
+                    mine[v] = dist_u + weights[i]
+                    parents[side][v] = u
+                    heappush(pq, (dist_u + weights[i], v))
+            side = 1 - side  # alternate between the two ends
+        return best, top, parents[0], parents[1]
+
+    # Expand the edge from a to b back into the original vertices it stands for,
+    # appending everything after a (up to and including b) to out
+    def _unpack(self, a: int, b: int, out: List[int]) -> None:
+        stack: List[Pair] = [(a, b)]
+        while stack:
+            x, y = stack.pop()
+            middle: Optional[int] = self._middles.get(_pair(x, y))
+            if middle is None:
+                out.append(y)  # an original edge
+            else:
+                stack.append((middle, y))  # second half goes on first so it comes off last
+                stack.append((x, middle))
+
+    # The shortest path from source to target as a list of original edges,
+    # None if target can't be reached and [] if source is target
+    def path(self, source: V, target: V) -> Optional[WeightedPath]:
+        first: int = self.index_of(source)
+        last: int = self.index_of(target)
+        if first == last:
+            return []
+        best, top, forward, backward = self._search(first, last)
+        if best is None:
+            return None
+        # the hierarchy path climbs from first up to top and back down to last
+        climb: List[int] = [top]
+        while climb[-1] != first:
+            climb.append(forward[climb[-1]])
+        climb.reverse()
+        while climb[-1] != last:
+            climb.append(backward[climb[-1]])
+        vertices: List[int] = [first]
+        for a, b in zip(climb, climb[1:]):
+            self._unpack(a, b, vertices)
+        return [WeightedEdge(u, v, self._weights[_pair(u, v)]) for u, v in zip(vertices, vertices[1:])]
+
+    # Shortest distance from source to target, None if it can't be reached.
+    # It's summed along the unpacked path in order, just as dijkstra() does.
+    # When several paths tie for shortest, the hierarchy may unpack a
+    # different one than dijkstra() picks, so with float weights the two
+    # sums can differ in the last bit or so (the paths are equally short).
+    def distance(self, source: V, target: V) -> Optional[float]:
+        path: Optional[WeightedPath] = self.path(source, target)
+        if path is None:
+            return None
+        distance: float = 0
+        for edge in path:
+            distance = edge.weight + distance
+        return distance
+
+    # Save the hierarchy as JSON (plain lists of numbers, nothing that gets
+    # run when it's read back in). The vertices have to be JSON values:
+    # strings, numbers, booleans, None, or tuples of those.
+    def save(self, filename: str) -> None:
+        data: Dict[str, Any] = {
+            "vertices": self._vertices,
+            "indices": sorted(self._indices.values()),
+            "weights": [[u, v, weight] for (u, v), weight in self._weights.items()],
+            "middles": [[u, v, middle] for (u, v), middle in self._middles.items()],
+            "offsets": self._offsets.tolist(),
+            "targets": self._targets.tolist(),
+            "up_weights": self._up_weights.tolist()
+        }
+        with open(filename, "w") as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, filename: str) -> ContractionHierarchy:
+        hierarchy: ContractionHierarchy = cls.__new__(cls)
+        with open(filename) as file:
+            data: Dict[str, Any] = json.load(file)
+        try:
+            hierarchy._vertices = [_from_json(vertex) for vertex in data["vertices"]]
+            hierarchy._indices = {hierarchy._vertices[index]: index for index in data["indices"]}
+            hierarchy._weights = {(u, v): weight for u, v, weight in data["weights"]}
+            hierarchy._middles = {(u, v): middle for u, v, middle in data["middles"]}
+            hierarchy._offsets = array('l', data["offsets"])
+            hierarchy._targets = array('i', data["targets"])
+            hierarchy._up_weights = array('d', data["up_weights"])
+        except (KeyError, IndexError, TypeError, ValueError) as error:
+            raise ValueError(f"{filename} is not a saved contraction hierarchy") from error
+        if (len(hierarchy._offsets) != len(hierarchy._vertices) + 1 or
+                hierarchy._offsets[-1] != len(hierarchy._targets) or len(hierarchy._targets) != len(hierarchy._up_weights)):
+            raise ValueError(f"{filename} is not a saved contraction hierarchy")
+        return hierarchy
+
+if __name__ == "__main__":
+    from time import perf_counter
+    from random import Random
+    from math import isclose
+    from tempfile import TemporaryDirectory
+    import os
+    from dijkstra import dijkstra, path_dict_to_path
+    from mst import print_weighted_path, total_weight
+
+    city_graph2: WeightedGraph[str] = WeightedGraph(["Seattle", "San Francisco", "Los Angeles", "Riverside", "Phoenix", "Chicago", "Boston", "New York", "Atlanta", "Miami", "Dallas", "Houston", "Detroit", "Philadelphia", "Washington"])
+
+    city_graph2.add_edge_by_vertices("Seattle", "Chicago", 1737)
+    city_graph2.add_edge_by_vertices("Seattle", "San Francisco", 678)
+    city_graph2.add_edge_by_vertices("San Francisco", "Riverside", 386)
+    city_graph2.add_edge_by_vertices("San Francisco", "Los Angeles", 348)
+    city_graph2.add_edge_by_vertices("Los Angeles", "Riverside", 50)
+    city_graph2.add_edge_by_vertices("Los Angeles", "Phoenix", 357)
+    city_graph2.add_edge_by_vertices("Riverside", "Phoenix", 307)
+    city_graph2.add_edge_by_vertices("Riverside", "Chicago", 1704)
+    city_graph2.add_edge_by_vertices("Phoenix", "Dallas", 887)
+    city_graph2.add_edge_by_vertices("Phoenix", "Houston", 1015)
+    city_graph2.add_edge_by_vertices("Dallas", "Chicago", 805)
+    city_graph2.add_edge_by_vertices("Dallas", "Atlanta", 721)
+    city_graph2.add_edge_by_vertices("Dallas", "Houston", 225)
+    city_graph2.add_edge_by_vertices("Houston", "Atlanta", 702)
+    city_graph2.add_edge_by_vertices("Houston", "Miami", 968)
+    city_graph2.add_edge_by_vertices("Atlanta", "Chicago", 588)
+    city_graph2.add_edge_by_vertices("Atlanta", "Washington", 543)
+    city_graph2.add_edge_by_vertices("Atlanta", "Miami", 604)
+    city_graph2.add_edge_by_vertices("Miami", "Washington", 923)
+    city_graph2.add_edge_by_vertices("Chicago", "Detroit", 238)
+    city_graph2.add_edge_by_vertices("Detroit", "Boston", 613)
+    city_graph2.add_edge_by_vertices("Detroit", "Washington", 396)
+    city_graph2.add_edge_by_vertices("Detroit", "New York", 482)
+    city_graph2.add_edge_by_vertices("Boston", "New York", 190)
+    city_graph2.add_edge_by_vertices("New York", "Philadelphia", 81)
+    city_graph2.add_edge_by_vertices("Philadelphia", "Washington", 123)
+
+    hierarchy: ContractionHierarchy[str] = ContractionHierarchy(city_graph2)
+    ch_path: Optional[WeightedPath] = hierarchy.path("Los Angeles", "Boston")
+    if ch_path is not None:
+        print("Shortest path from Los Angeles to Boston:")
+        print_weighted_path(city_graph2, ch_path)
+        print("")  # blank line
+
+    # Every pair of vertices should get a path along the graph's own edges
+    # that is as short as dijkstra()'s. Tied paths may differ, and so may
+    # their float sums in the last bit, hence the tolerance.
+    def agrees(wg: WeightedGraph, ch: ContractionHierarchy) -> bool:
+        for source in range(wg.vertex_count):
+            distances, _ = dijkstra(wg, wg.vertex_at(source))
+            for target in range(wg.vertex_count):
+                if target == source:
+                    continue
+                found: Optional[WeightedPath] = ch.path(wg.vertex_at(source), wg.vertex_at(target))
+                expected: Optional[float] = distances[target]
+                if found is None or expected is None:
+                    if found is not expected:
+                        return False
+                    continue
+                follows_edges: bool = all(any(edge.v == graph_edge.v and edge.weight == graph_edge.weight
+                                              for graph_edge in wg.edges_for_index(edge.u)) for edge in found)
+                connected: bool = found[0].u == source and found[-1].v == target and all(
+                    first.v == second.u for first, second in zip(found, found[1:]))
+                if not (follows_edges and connected and isclose(total_weight(found), expected, rel_tol=1e-9)):
+                    return False
+        return True
+
+    agree: bool = agrees(city_graph2, hierarchy)
+    print(f"Agrees with dijkstra on every pair: {agree}")
+
+    # mixed int and float weights with plenty of ties between paths
+    rng: Random = Random(0)
+    mixed: WeightedGraph[int] = WeightedGraph(list(range(40)))
+    for _ in range(100):
+        mixed.add_edge_by_indices(rng.randrange(40), rng.randrange(40), rng.choice([rng.randint(1, 5), round(rng.uniform(1, 5), 3)]))
+    print(f"Agrees with dijkstra on a mixed-weight graph: {agrees(mixed, ContractionHierarchy(mixed))}")
+
+    # time queries on a bigger random road-like grid
+    rng = Random(0)
+    side: int = 60
+    grid: WeightedGraph[Tuple[int, int]] = WeightedGraph([(r, c) for r in range(side) for c in range(side)])
+    for r in range(side):
+        for c in range(side):
+            if c + 1 < side:
+                grid.add_edge_by_indices(r * side + c, r * side + c + 1, rng.uniform(1.0, 10.0))
+            if r + 1 < side:
+                grid.add_edge_by_indices(r * side + c, (r + 1) * side + c, rng.uniform(1.0, 10.0))
+    start: float = perf_counter()
+    grid_hierarchy: ContractionHierarchy[Tuple[int, int]] = ContractionHierarchy(grid)
+    print(f"Preprocessed {grid.vertex_count} vertices in {perf_counter() - start:.2f} seconds")
+    pairs: List[Tuple[Tuple[int, int], Tuple[int, int]]] = [(grid.vertex_at(rng.randrange(grid.vertex_count)), grid.vertex_at(rng.randrange(grid.vertex_count))) for _ in range(200)]
+    start = perf_counter()
+    for source_vertex, target_vertex in pairs:
+        grid_hierarchy.distance(source_vertex, target_vertex)
+    print(f"Average query: {(perf_counter() - start) / len(pairs) * 1000:.3f} ms")
+    start = perf_counter()
+    for source_vertex, target_vertex in pairs[:20]:
+        dijkstra(grid, source_vertex)
+    print(f"Average dijkstra: {(perf_counter() - start) / 20 * 1000:.3f} ms")
+
+    # a saved and reloaded hierarchy answers the same
+    with TemporaryDirectory() as directory:
+        filename: str = os.path.join(directory, "grid.json")
+        grid_hierarchy.save(filename)
+        loaded: ContractionHierarchy[Tuple[int, int]] = ContractionHierarchy.load(filename)
+    same: bool = all(loaded.path(source_vertex, target_vertex) == grid_hierarchy.path(source_vertex, target_vertex)
+                     for source_vertex, target_vertex in pairs)
+    print(f"Reloaded hierarchy agrees: {same}")
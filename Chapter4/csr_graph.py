@@ -0,0 +1,204 @@
+# csr_graph.py
+# From Classic Computer Science Problems in Python Chapter 4
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import TypeVar, Generic, List, Dict, Tuple, Optional, Any
+from array import array
+from edge import Edge
+from weighted_edge import WeightedEdge
+from graph import Graph
+from weighted_graph import WeightedGraph
+
+V = TypeVar('V')  # type of the vertices in the graph
+
+
+# A frozen compressed-sparse-row copy of a Graph. The edges leaving vertex u
+# are the targets in _targets[_offsets[u]:_offsets[u + 1]], so the whole
+# adjacency structure lives in two flat arrays instead of one Edge per direction.
+class CSRGraph(Generic[V]):
+    def __init__(self, graph: Graph[V]) -> None:
+        self._vertices: List[V] = [graph.vertex_at(i) for i in range(graph.vertex_count)]
+        self._indices: Dict[V, int] = {}
+        for index, vertex in enumerate(self._vertices):
+            if not graph.is_removed(index):  # removed vertices stay as isolated slots
+                self._indices.setdefault(vertex, index)  # first occurrence wins, like list.index
+        offsets: array = array('l', [0])
+        targets: array = array('i')
+        for u in range(graph.vertex_count):
+            for edge in graph.edges_for_index(u):
+                targets.append(edge.v)
+            offsets.append(len(targets))
+        # read-only views so that the arrays can't be changed after construction
+        self._offsets: memoryview = memoryview(offsets).toreadonly()
+        self._targets: memoryview = memoryview(targets).toreadonly()
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self._vertices)  # Number of vertices
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._targets)  # Number of edges
+
+    # Find the vertex at a specific index
+    def vertex_at(self, index: int) -> V:
+        return self._vertices[index]
+
+    # Find the index of a vertex in the graph
+    def index_of(self, vertex: V) -> int:
+        try:
+            return self._indices[vertex]
+        except KeyError:
+            raise ValueError(f"{vertex!r} is not in graph") from None
+
+    # The indices of the vertices that a vertex at some index is connected to
+    # (a zero-copy slice of the target array)
+    def neighbor_indices_for_index(self, index: int) -> memoryview:
+        return self._targets[self._offsets[index]:self._offsets[index + 1]]
+
+    # Find the vertices that a vertex at some index is connected to
+    def neighbors_for_index(self, index: int) -> List[V]:
+        return list(map(self.vertex_at, self.neighbor_indices_for_index(index)))
+
+    # Lookup a vertice's index and find its neighbors (convenience method)
+    def neighbors_for_vertex(self, vertex: V) -> List[V]:
+        return self.neighbors_for_index(self.index_of(vertex))
+
+    # Return all of the edges associated with a vertex at some index
+    # (the Edge objects are built on demand and aren't stored)
+    def edges_for_index(self, index: int) -> List[Edge]:
+        return [Edge(index, v) for v in self.neighbor_indices_for_index(index)]
+
+    # Lookup the index of a vertex and return its edges (convenience method)
+    def edges_for_vertex(self, vertex: V) -> List[Edge]:
+        return self.edges_for_index(self.index_of(vertex))
+
+    # memoryviews can't be pickled, so ship the arrays underneath them
+    # instead (lets a snapshot be handed to worker processes)
+    def __getstate__(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = self.__dict__.copy()
+        for name, value in state.items():
+            if isinstance(value, memoryview):
+                state[name] = value.obj
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            if isinstance(value, array):
+                state[name] = memoryview(value).toreadonly()
+        self.__dict__.update(state)
+
+    # Make it easy to pretty-print a CSRGraph
+    def __str__(self) -> str:
+        desc: str = ""
+        for i in range(self.vertex_count):
+            desc += f"{self.vertex_at(i)} -> {self.neighbors_for_index(i)}\n"
+        return desc
+
+
+# A CSRGraph with a weight array that runs parallel to the target array
+class WeightedCSRGraph(Generic[V], CSRGraph[V]):
+    def __init__(self, graph: WeightedGraph[V]) -> None:
+        super().__init__(graph)
+        weights: array = array('d')
+        for u in range(graph.vertex_count):
+            for edge in graph.edges_for_index(u):
+                weights.append(edge.weight)
+        self._weights: memoryview = memoryview(weights).toreadonly()
+
+    # The weights of the edges leaving a vertex at some index, in the same
+    # order as neighbor_indices_for_index()
+    def weights_for_index(self, index: int) -> memoryview:
+        return self._weights[self._offsets[index]:self._offsets[index + 1]]
+
+    def edges_for_index(self, index: int) -> List[WeightedEdge]:
+        return [WeightedEdge(index, v, weight) for v, weight
+                in zip(self.neighbor_indices_for_index(index), self.weights_for_index(index))]
+
+    def neighbors_for_index_with_weights(self, index: int) -> List[Tuple[V, float]]:
+        return [(self.vertex_at(v), weight) for v, weight
+                in zip(self.neighbor_indices_for_index(index), self.weights_for_index(index))]
+
+    def __str__(self) -> str:
+        desc: str = ""
+        for i in range(self.vertex_count):
+            desc += f"{self.vertex_at(i)} -> {self.neighbors_for_index_with_weights(i)}\n"
+        return desc
+
+
+if __name__ == "__main__":
+    from dijkstra import dijkstra, distance_array_to_vertex_dict, path_dict_to_path
+    from mst import WeightedPath, mst, print_weighted_path
+
+    city_graph2: WeightedGraph[str] = WeightedGraph(["Seattle", "San Francisco", "Los Angeles", "Riverside", "Phoenix", "Chicago", "Boston", "New York", "Atlanta", "Miami", "Dallas", "Houston", "Detroit", "Philadelphia", "Washington"])
+
+    city_graph2.add_edge_by_vertices("Seattle", "Chicago", 1737)
+    city_graph2.add_edge_by_vertices("Seattle", "San Francisco", 678)
+    city_graph2.add_edge_by_vertices("San Francisco", "Riverside", 386)
+    city_graph2.add_edge_by_vertices("San Francisco", "Los Angeles", 348)
+    city_graph2.add_edge_by_vertices("Los Angeles", "Riverside", 50)
+    city_graph2.add_edge_by_vertices("Los Angeles", "Phoenix", 357)
+    city_graph2.add_edge_by_vertices("Riverside", "Phoenix", 307)
+    city_graph2.add_edge_by_vertices("Riverside", "Chicago", 1704)
+    city_graph2.add_edge_by_vertices("Phoenix", "Dallas", 887)
+    city_graph2.add_edge_by_vertices("Phoenix", "Houston", 1015)
+    city_graph2.add_edge_by_vertices("Dallas", "Chicago", 805)
+    city_graph2.add_edge_by_vertices("Dallas", "Atlanta", 721)
+    city_graph2.add_edge_by_vertices("Dallas", "Houston", 225)
+    city_graph2.add_edge_by_vertices("Houston", "Atlanta", 702)
+    city_graph2.add_edge_by_vertices("Houston", "Miami", 968)
+    city_graph2.add_edge_by_vertices("Atlanta", "Chicago", 588)
+    city_graph2.add_edge_by_vertices("Atlanta", "Washington", 543)
+    city_graph2.add_edge_by_vertices("Atlanta", "Miami", 604)
+    city_graph2.add_edge_by_vertices("Miami", "Washington", 923)
+    city_graph2.add_edge_by_vertices("Chicago", "Detroit", 238)
+    city_graph2.add_edge_by_vertices("Detroit", "Boston", 613)
+    city_graph2.add_edge_by_vertices("Detroit", "Washington", 396)
+    city_graph2.add_edge_by_vertices("Detroit", "New York", 482)
+    city_graph2.add_edge_by_vertices("Boston", "New York", 190)
+    city_graph2.add_edge_by_vertices("New York", "Philadelphia", 81)
+    city_graph2.add_edge_by_vertices("Philadelphia", "Washington", 123)
+
+    csr_graph: WeightedCSRGraph[str] = WeightedCSRGraph(city_graph2)
+    print(csr_graph)
+
+    # dijkstra and mst only need the read-only Graph surface
+    distances, path_dict = dijkstra(csr_graph, "Los Angeles")
+    print("Distances from Los Angeles:")
+    for key, value in distance_array_to_vertex_dict(csr_graph, distances).items():
+        print(f"{key} : {value}")
+    print("")  # blank line
+
+    print("Shortest path from Los Angeles to Boston:")
+    path: WeightedPath = path_dict_to_path(csr_graph.index_of("Los Angeles"), csr_graph.index_of("Boston"), path_dict)
+    print_weighted_path(csr_graph, path)
+    print("")  # blank line
+
+    print("Minimum spanning tree:")
+    result: Optional[WeightedPath] = mst(csr_graph)
+    if result is not None:
+        print_weighted_path(csr_graph, result)
+    print("")  # blank line
+
+    # Reuse BFS from Chapter 2 on the CSR graph
+    import sys
+    sys.path.insert(0, '..')  # so we can access the Chapter2 package in the parent directory
+    from Chapter2.generic_search import bfs, Node, node_to_path
+
+    bfs_result: Optional[Node[str]] = bfs("Boston", lambda x: x == "Miami", csr_graph.neighbors_for_vertex)
+    if bfs_result is None:
+        print("No solution found using breadth-first search!")
+    else:
+        print("Path from Boston to Miami:")
+        print(node_to_path(bfs_result))
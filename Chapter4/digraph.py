@@ -10,39 +10,45 @@ V = TypeVar('V') # type of the vertices in the graph
 
 class Digraph(Generic[V], Graph[V]):
     def __init__(self, vertices: List[V] = []) -> None:
-        self._vertices: List[V] = vertices
-        self._edges: List[List[Edge]] = [[] for _ in vertices]
+        super().__init__(vertices)
+        # reverse adjacency, so incoming edges cost O(in-degree) to find
+        self._incoming: List[List[Edge]] = [[] for _ in vertices]
 
-    def remove_vertex_by_index(self, u: int) -> None:
-        for edge in reversed(self.edges_for_index(u)):
-            self.remove_edge(edge)
-        for edge in reversed(self.edges_to_index(u)):
-            self.remove_edge(edge)
-        del self._edges[u]
-        del self._vertices[u]
-        for edges in self._edges:
-            for edge in edges:
-                if edge.u > u:
-                    edge.u -= 1
-                if edge.v > u:
-                    edge.v -= 1
+    def add_vertex(self, vertex: V) -> int:
+        self._incoming.append([])
+        return super().add_vertex(vertex)
 
-    # This is an undirected graph,
-    # so we always add edges in both directions
+    # Remove every edge into or out of the vertex at index u
+    def _detach(self, u: int) -> None:
+        outgoing: List[Edge] = self._edges[u]
+        incoming: List[Edge] = self._incoming[u]
+        self._edges[u] = []
+        self._incoming[u] = []
+        for edge in outgoing:
+            if edge.v != u:  # self-loops were in both lists
+                self._incoming[edge.v].remove(edge)
+        for edge in incoming:
+            if edge.u != u:
+                self._edges[edge.u].remove(edge)
+
+    def compact(self) -> None:
+        # the Edge objects are shared with _edges, which renumbers them
+        self._incoming = [edges for edges, removed in zip(self._incoming, self._removed) if not removed]
+        super().compact()
+
+    # This is a directed graph,
+    # so edges only go one way
     def add_edge(self, edge: Edge) -> None:
         self._edges[edge.u].append(edge)
+        self._incoming[edge.v].append(edge)
 
     def remove_edge(self, edge: Edge) -> None:
         self._edges[edge.u].remove(edge)
+        self._incoming[edge.v].remove(edge)
         print(f"Removed {self._vertices[edge.u]} -> {self._vertices[edge.v]}")
     
     def edges_to_index(self, v: int) -> List[Edge]:
-        edges_to_vertex: List[Edge] = []
-        for edges in self._edges:
-            for edge in edges:
-                if edge.v == v:
-                    edges_to_vertex.append(edge)
-        return edges_to_vertex
+        return self._incoming[v]
 
     # Find the vertices that a vertex at some index is connected to
     def neighbors_for_index(self, index: int) -> List[V]:
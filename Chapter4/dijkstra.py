@@ -19,7 +19,7 @@ from dataclasses import dataclass
 from mst import WeightedPath, print_weighted_path
 from weighted_graph import WeightedGraph
 from weighted_edge import WeightedEdge
-from priority_queue import PriorityQueue
+from priority_queue import PriorityQueue, IndexedPriorityQueue
 
 V = TypeVar('V') # type of the vertices in the graph
 
@@ -38,7 +38,11 @@ class DijkstraNode:
         return self.distance == other.distance
 
 
-def dijkstra(wg: WeightedGraph[V], root: V) -> Tuple[List[Optional[float]], Dict[int, WeightedEdge]]:
+# indexed=True keeps each vertex in the queue at most once and lowers its
+# priority with decrease_key, instead of pushing a new DijkstraNode per relaxation
+def dijkstra(wg: WeightedGraph[V], root: V, indexed: bool = False) -> Tuple[List[Optional[float]], Dict[int, WeightedEdge]]:
+    if indexed:
+        return _dijkstra_indexed(wg, root)
     first: int = wg.index_of(root) # find starting index
     # distances are unknown at first
     distances: List[Optional[float]] = [None] * wg.vertex_count
@@ -66,6 +70,163 @@ def dijkstra(wg: WeightedGraph[V], root: V) -> Tuple[List[Optional[float]], Dict
     return distances, path_dict
 
 
+def _dijkstra_indexed(wg: WeightedGraph[V], root: V) -> Tuple[List[Optional[float]], Dict[int, WeightedEdge]]:
+    first: int = wg.index_of(root)  # find starting index
+    # distances are unknown at first
+    distances: List[Optional[float]] = [None] * wg.vertex_count
+    distances[first] = 0  # the root is 0 away from the root
+    path_dict: Dict[int, WeightedEdge] = {}  # how we got to each vertex
+    pq: IndexedPriorityQueue = IndexedPriorityQueue(wg.vertex_count)
+    pq.push(first, 0)
+
+    while not pq.empty:
+        u, dist_u = pq.pop()  # explore the next closest vertex
+        for we in wg.edges_for_index(u):
+            # the old distance to this vertex
+            dist_v: Optional[float] = distances[we.v]
+            # no old distance or found shorter path
+            if dist_v is None or dist_v > we.weight + dist_u:
+                distances[we.v] = we.weight + dist_u
+                path_dict[we.v] = we
+                if we.v in pq:  # already waiting, so just move it up
+                    pq.decrease_key(we.v, we.weight + dist_u)
+                else:
+                    pq.push(we.v, we.weight + dist_u)
+
+    return distances, path_dict
+
+
+# Point-to-point version that stops as soon as target is settled, so only
+# the vertices closer to root than target get explored. Returns the
+# distance to target (None if it can't be reached) and a path_dict
+# that path_dict_to_path() can walk from target back to root.
+def dijkstra_to(wg: WeightedGraph[V], root: V, target: V) -> Tuple[Optional[float], Dict[int, WeightedEdge]]:
+    first: int = wg.index_of(root)  # find starting index
+    last: int = wg.index_of(target)
+    distances: Dict[int, float] = {first: 0}  # only vertices we've reached
+    path_dict: Dict[int, WeightedEdge] = {}  # how we got to each vertex
+    pq: PriorityQueue[DijkstraNode] = PriorityQueue()
+    pq.push(DijkstraNode(first, 0))
+
+    while not pq.empty:
+        node: DijkstraNode = pq.pop()
+        u: int = node.vertex
+        if node.distance > distances[u]:
+            continue  # stale entry, u was already settled closer
+        if u == last:
+            return distances[u], path_dict  # target settled, we're done
+        for we in wg.edges_for_index(u):
+            new_distance: float = we.weight + node.distance
+            if we.v not in distances or distances[we.v] > new_distance:
+                distances[we.v] = new_distance
+                path_dict[we.v] = we
+                pq.push(DijkstraNode(we.v, new_distance))
+
+    return None, path_dict  # target isn't reachable from root
+
+
+# Point-to-point version that searches forward from root and backward from
+# target at the same time, stopping once the two searches can no longer
+# improve on the best meeting point. Since WeightedGraph is undirected, the
+# backward search follows the same edges reversed. Returns the same shape
+# of result as dijkstra_to(), but path_dict only holds the edges of the path.
+def bidirectional_dijkstra(wg: WeightedGraph[V], root: V, target: V) -> Tuple[Optional[float], Dict[int, WeightedEdge]]:
+    first: int = wg.index_of(root)  # find starting index
+    last: int = wg.index_of(target)
+    if first == last:
+        return 0, {}
+    forward: Dict[int, float] = {first: 0}  # distances from root
+    backward: Dict[int, float] = {last: 0}  # distances to target
+    forward_path: Dict[int, WeightedEdge] = {}  # edge into each vertex from root's side
+    backward_path: Dict[int, WeightedEdge] = {}  # edge out of each vertex toward target
+    forward_pq: PriorityQueue[DijkstraNode] = PriorityQueue()
+    forward_pq.push(DijkstraNode(first, 0))
+    backward_pq: PriorityQueue[DijkstraNode] = PriorityQueue()
+    backward_pq.push(DijkstraNode(last, 0))
+    forward_top: float = 0  # distance of the last vertex each side settled
+    backward_top: float = 0
+    best: Optional[float] = None  # length of the shortest path found so far
+    meeting: int = -1  # the vertex where that path crosses from one side to the other
+
+    while not forward_pq.empty and not backward_pq.empty:
+        # every unsettled vertex is at least this far from both ends
+        if best is not None and forward_top + backward_top >= best:
+            break
+        # grow whichever side has the smaller frontier
+        is_forward: bool = len(forward_pq) <= len(backward_pq)
+        pq: PriorityQueue[DijkstraNode] = forward_pq if is_forward else backward_pq
+        distances: Dict[int, float] = forward if is_forward else backward
+        other: Dict[int, float] = backward if is_forward else forward
+        node: DijkstraNode = pq.pop()
+        u: int = node.vertex
+        if node.distance > distances[u]:
+            continue  # stale entry
+        if is_forward:
+            forward_top = node.distance
+        else:
+            backward_top = node.distance
+        for we in wg.edges_for_index(u):
+            new_distance: float = we.weight + node.distance
+            if we.v not in distances or distances[we.v] > new_distance:
+                distances[we.v] = new_distance
+                if is_forward:
+                    forward_path[we.v] = we
+                else:
+                    backward_path[we.v] = we.reversed()  # points back toward target
+                pq.push(DijkstraNode(we.v, new_distance))
+            # a vertex both searches have reached joins up a root -> target path
+            if we.v in other and (best is None or distances[we.v] + other[we.v] < best):
+                best = distances[we.v] + other[we.v]
+                meeting = we.v
+
+    if best is None:
+        return None, {}  # target isn't reachable from root
+    # stitch the two halves together so path_dict_to_path() can walk it
+    path_dict: Dict[int, WeightedEdge] = {}
+    v: int = meeting
+    while v != first:
+        path_dict[v] = forward_path[v]
+        v = forward_path[v].u
+    v = meeting
+    while v != last:
+        path_dict[backward_path[v].v] = backward_path[v]
+        v = backward_path[v].v
+    return best, path_dict
+
+
+# Run dijkstra from several roots at once, as though they were all joined
+# to a single super-root by zero-weight edges. Along with the distance to the
+# nearest root and the path_dict, returns that nearest root's index for each
+# vertex, which is the start to pass to path_dict_to_path().
+def multi_source_dijkstra(wg: WeightedGraph[V], roots: List[V]) -> Tuple[List[Optional[float]], Dict[int, WeightedEdge], List[Optional[int]]]:
+    # distances are unknown at first
+    distances: List[Optional[float]] = [None] * wg.vertex_count
+    origins: List[Optional[int]] = [None] * wg.vertex_count  # nearest root to each vertex
+    path_dict: Dict[int, WeightedEdge] = {}  # how we got to each vertex
+    pq: PriorityQueue[DijkstraNode] = PriorityQueue()
+    for root in roots:
+        first: int = wg.index_of(root)
+        distances[first] = 0  # every root is 0 away from the roots
+        origins[first] = first
+        pq.push(DijkstraNode(first, 0))
+
+    while not pq.empty:
+        node: DijkstraNode = pq.pop()
+        u: int = node.vertex
+        dist_u: Optional[float] = distances[u]
+        if dist_u is None or node.distance > dist_u:
+            continue  # stale entry
+        for we in wg.edges_for_index(u):
+            dist_v: Optional[float] = distances[we.v]
+            if dist_v is None or dist_v > we.weight + dist_u:
+                distances[we.v] = we.weight + dist_u
+                origins[we.v] = origins[u]
+                path_dict[we.v] = we
+                pq.push(DijkstraNode(we.v, we.weight + dist_u))
+
+    return distances, path_dict, origins
+
+
 # Helper function to get easier access to dijkstra results
 def distance_array_to_vertex_dict(wg: WeightedGraph[V], distances: List[Optional[float]]) -> Dict[V, Optional[float]]:
     distance_dict: Dict[V, Optional[float]] = {}
@@ -128,3 +289,18 @@ if __name__ == "__main__":
     print("Shortest path from Los Angeles to Boston:")
     path: WeightedPath = path_dict_to_path(city_graph2.index_of("Los Angeles"), city_graph2.index_of("Boston"), path_dict)
     print_weighted_path(city_graph2, path)
+    print("")  # blank line
+
+    # the single-pair versions should find a path of the same length
+    for single_pair in [dijkstra_to, bidirectional_dijkstra]:
+        distance, pair_path_dict = single_pair(city_graph2, "Los Angeles", "Boston")
+        print(f"{single_pair.__name__} from Los Angeles to Boston: {distance}")
+        print_weighted_path(city_graph2, path_dict_to_path(city_graph2.index_of("Los Angeles"), city_graph2.index_of("Boston"), pair_path_dict))
+        print("")  # blank line
+
+    print("Nearest of Seattle and Miami to each city:")
+    multi_distances, multi_path_dict, origins = multi_source_dijkstra(city_graph2, ["Seattle", "Miami"])
+    for i in range(city_graph2.vertex_count):
+        origin: Optional[int] = origins[i]
+        if origin is not None:
+            print(f"{city_graph2.vertex_at(i)} : {city_graph2.vertex_at(origin)} {multi_distances[i]}")
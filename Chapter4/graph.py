@@ -13,7 +13,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import TypeVar, Generic, List, Optional
+from typing import TypeVar, Generic, List, Optional, Dict, Iterable, Tuple
 from edge import Edge
 
 
@@ -24,7 +24,19 @@ class Graph(Generic[V]):
     def __init__(self, vertices: List[V] = []) -> None:
         self._vertices: List[V] = vertices
         self._edges: List[List[Edge]] = [[] for _ in vertices]
-
+        self._removed: List[bool] = [False for _ in vertices]  # tombstones
+        self._indices: Dict[V, int] = {}  # vertex -> index, so lookups don't scan
+        self._rebuild_indices()
+
+    # Refill the vertex -> index table from scratch
+    def _rebuild_indices(self) -> None:
+        self._indices.clear()
+        for index, vertex in enumerate(self._vertices):
+            if not self._removed[index]:
+                self._indices.setdefault(vertex, index)  # first occurrence wins, like list.index
+
+    # Number of vertex slots, including removed vertices that
+    # are still waiting for compact()
     @property
     def vertex_count(self) -> int:
         return len(self._vertices) # Number of vertices
@@ -37,24 +49,55 @@ class Graph(Generic[V]):
     def add_vertex(self, vertex: V) -> int:
         self._vertices.append(vertex)
         self._edges.append([]) # add empty list for containing edges
+        self._removed.append(False)
+        self._indices.setdefault(vertex, self.vertex_count - 1)
         return self.vertex_count - 1 # return index of added vertex
         
-    def remove_vertex(self, vertex: V) -> None:
+    def remove_vertex(self, vertex: V, compact: bool = True) -> None:
         u: int = self.index_of(vertex)
-        self.remove_vertex_by_index(u)
-
-    def remove_vertex_by_index(self, u: int) -> None:
-        for edge in reversed(self.edges_for_index(u)):
-            print(f"Edges {self._vertices[edge.u]} - {self._vertices[edge.v]}")
-            self.remove_edge(edge)
-        del self._edges[u]
-        del self._vertices[u]
+        self.remove_vertex_by_index(u, compact)
+
+    # Drop a vertex and its edges. With compact=False the vertex is only
+    # marked as removed so every other index stays put; call compact()
+    # once after a batch of removals to renumber everything in one pass.
+    def remove_vertex_by_index(self, u: int, compact: bool = True) -> None:
+        self._detach(u)
+        self._removed[u] = True
+        if self._indices.get(self._vertices[u]) == u:
+            del self._indices[self._vertices[u]]
+        if compact:
+            self.compact()
+
+    # Remove every edge touching the vertex at index u
+    def _detach(self, u: int) -> None:
+        edges: List[Edge] = self._edges[u]
+        self._edges[u] = []
+        for edge in edges:
+            if edge.v != u:  # a self-loop's reverse was in edges too
+                self._edges[edge.v].remove(edge.reversed())
+
+    def is_removed(self, index: int) -> bool:
+        return self._removed[index]
+
+    # Squeeze out removed vertices, renumbering the remaining
+    # vertices and their edges in a single pass
+    def compact(self) -> None:
+        if not any(self._removed):
+            return
+        new_indices: List[int] = []  # old index -> new index
+        count: int = 0
+        for removed in self._removed:
+            new_indices.append(count)
+            if not removed:
+                count += 1
+        self._vertices[:] = [vertex for vertex, removed in zip(self._vertices, self._removed) if not removed]
+        self._edges = [edges for edges, removed in zip(self._edges, self._removed) if not removed]
         for edges in self._edges:
             for edge in edges:
-                if edge.u > u:
-                    edge.u -= 1
-                if edge.v > u:
-                    edge.v -= 1
+                edge.u = new_indices[edge.u]
+                edge.v = new_indices[edge.v]
+        self._removed = [False for _ in self._vertices]
+        self._rebuild_indices()
 
     # This is an undirected graph,
     # so we always add edges in both directions
@@ -69,10 +112,23 @@ class Graph(Generic[V]):
 
     # Add an edge by looking up vertex indices (convenience method)
     def add_edge_by_vertices(self, first: V, second: V) -> None:
-        u: int = self._vertices.index(first)
-        v: int = self._vertices.index(second)
+        u: int = self.index_of(first)
+        v: int = self.index_of(second)
         self.add_edge_by_indices(u, v)
 
+    # Find the index of a vertex, adding the vertex first if it is new
+    def _index_or_add(self, vertex: V) -> int:
+        index: Optional[int] = self._indices.get(vertex)
+        if index is None:
+            index = self.add_vertex(vertex)
+        return index
+
+    # Build up the graph from (first, second) vertex pairs in a single pass,
+    # adding any vertices that haven't been seen before
+    def add_edges_from(self, edges: Iterable[Tuple[V, V]]) -> None:
+        for first, second in edges:
+            self.add_edge_by_indices(self._index_or_add(first), self._index_or_add(second))
+
     def remove_edge(self, edge: Edge) -> None:
         self._edges[edge.u].remove(edge)
         self._edges[edge.v].remove(edge.reversed())
@@ -83,8 +139,8 @@ class Graph(Generic[V]):
         self.remove_edge(edge)
 
     def remove_edge_by_vertices(self, first: V, second: V) -> None:
-        u: int = self._vertices.index(first)
-        v: int = self._vertices.index(second)
+        u: int = self.index_of(first)
+        v: int = self.index_of(second)
         self.remove_edge_by_indices(u, v)
 
     # Find the vertex at a specific index
@@ -93,7 +149,10 @@ class Graph(Generic[V]):
 
     # Find the index of a vertex in the graph
     def index_of(self, vertex: V) -> int:
-        return self._vertices.index(vertex)
+        try:
+            return self._indices[vertex]
+        except KeyError:
+            raise ValueError(f"{vertex!r} is not in graph") from None
 
     # Find the vertices that a vertex at some index is connected to
     def neighbors_for_index(self, index: int) -> List[V]:
@@ -115,7 +174,8 @@ class Graph(Generic[V]):
     def __str__(self) -> str:
         desc: str = ""
         for i in range(self.vertex_count):
-            desc += f"{self.vertex_at(i)} -> {self.neighbors_for_index(i)}\n"
+            if not self.is_removed(i):
+                desc += f"{self.vertex_at(i)} -> {self.neighbors_for_index(i)}\n"
         return desc
 
 
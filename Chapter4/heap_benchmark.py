@@ -0,0 +1,99 @@
+# heap_benchmark.py
+# From Classic Computer Science Problems in Python Chapter 4
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# Compares the lazy PriorityQueue against the decrease-key IndexedPriorityQueue
+# inside dijkstra() and mst() on dense random graphs
+from typing import TypeVar, List, Tuple, Callable, Any
+from random import Random
+from time import perf_counter
+import dijkstra as dijkstra_module
+import mst as mst_module
+from weighted_graph import WeightedGraph
+from priority_queue import PriorityQueue, IndexedPriorityQueue
+
+T = TypeVar('T')
+
+
+# Record the largest size each kind of queue reaches
+class PeakPriorityQueue(PriorityQueue[T]):
+    peak: int = 0
+
+    def push(self, item: T) -> None:
+        super().push(item)
+        PeakPriorityQueue.peak = max(PeakPriorityQueue.peak, len(self))
+
+
+class PeakIndexedPriorityQueue(IndexedPriorityQueue):
+    peak: int = 0
+
+    def push(self, index: int, priority: float) -> None:
+        super().push(index, priority)
+        PeakIndexedPriorityQueue.peak = max(PeakIndexedPriorityQueue.peak, len(self))
+
+
+def random_dense_graph(vertex_count: int, density: float, seed: int = 0) -> WeightedGraph[int]:
+    rng: Random = Random(seed)
+    wg: WeightedGraph[int] = WeightedGraph(list(range(vertex_count)))
+    for u in range(vertex_count):
+        for v in range(u + 1, vertex_count):
+            if rng.random() < density:
+                wg.add_edge_by_indices(u, v, rng.uniform(1.0, 100.0))
+    return wg
+
+
+def best_time(function: Callable[[], Any], repeats: int = 3) -> float:
+    best: float = float("inf")
+    for _ in range(repeats):
+        start: float = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+# Run function with the instrumented queues swapped in and
+# return the peak sizes of the (lazy, indexed) queues
+def peak_sizes(function: Callable[[], Any]) -> Tuple[int, int]:
+    PeakPriorityQueue.peak = 0
+    PeakIndexedPriorityQueue.peak = 0
+    modules: List[Any] = [dijkstra_module, mst_module]
+    for module in modules:
+        module.PriorityQueue = PeakPriorityQueue
+        module.IndexedPriorityQueue = PeakIndexedPriorityQueue
+    try:
+        function()
+    finally:
+        for module in modules:
+            module.PriorityQueue = PriorityQueue
+            module.IndexedPriorityQueue = IndexedPriorityQueue
+    return PeakPriorityQueue.peak, PeakIndexedPriorityQueue.peak
+
+
+if __name__ == "__main__":
+    print(f"{'algorithm':<10}{'vertices':>9}{'edges':>9}{'queue':>9}{'peak size':>11}{'seconds':>10}")
+    for vertex_count, density in [(250, 0.5), (500, 0.5), (1000, 0.25)]:
+        wg: WeightedGraph[int] = random_dense_graph(vertex_count, density)
+        edge_count: int = wg.edge_count // 2
+        for name, run in [("dijkstra", lambda indexed: dijkstra_module.dijkstra(wg, 0, indexed)),
+                          ("mst", lambda indexed: mst_module.mst(wg, 0, indexed))]:
+            # both versions have to agree before their speeds mean anything
+            if name == "dijkstra":
+                assert run(False)[0] == run(True)[0]
+            else:
+                assert mst_module.total_weight(run(False)) == mst_module.total_weight(run(True))
+            lazy_peak, _ = peak_sizes(lambda: run(False))
+            _, indexed_peak = peak_sizes(lambda: run(True))
+            for queue, peak, indexed in [("lazy", lazy_peak, False), ("indexed", indexed_peak, True)]:
+                seconds: float = best_time(lambda: run(indexed))
+                print(f"{name:<10}{vertex_count:>9}{edge_count:>9}{queue:>9}{peak:>11}{seconds:>10.4f}")
@@ -13,10 +13,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import TypeVar, List, Optional
+from typing import TypeVar, List, Optional, Dict, Tuple, Union, MutableSequence
+from array import array
+from multiprocessing import Pool, cpu_count
+from multiprocessing.sharedctypes import RawArray
 from weighted_graph import WeightedGraph
 from weighted_edge import WeightedEdge
-from priority_queue import PriorityQueue
+from priority_queue import PriorityQueue, IndexedPriorityQueue
+from union_find import UnionFind
+from csr_graph import WeightedCSRGraph
 
 V = TypeVar('V') # type of the vertices in the graph
 WeightedPath = List[WeightedEdge] # type alias for paths
@@ -26,9 +31,13 @@ def total_weight(wp: WeightedPath) -> float:
     return sum([e.weight for e in wp])
 
 
-def mst(wg: WeightedGraph[V], start: int = 0) -> Optional[WeightedPath]:
+# indexed=True runs the eager version of Prim's algorithm: each vertex is in
+# the queue at most once, keyed by the cheapest edge found to it so far
+def mst(wg: WeightedGraph[V], start: int = 0, indexed: bool = False) -> Optional[WeightedPath]:
     if start > (wg.vertex_count - 1) or start < 0:
         return None
+    if indexed:
+        return _mst_indexed(wg, start)
     result: WeightedPath = [] # holds the final MST
     pq: PriorityQueue[WeightedEdge] = PriorityQueue()
     visited: List[bool] = [False] * wg.vertex_count # where we've been
@@ -53,6 +62,140 @@ def mst(wg: WeightedGraph[V], start: int = 0) -> Optional[WeightedPath]:
     return result
 
 
+def _mst_indexed(wg: WeightedGraph[V], start: int) -> WeightedPath:
+    result: WeightedPath = []  # holds the final MST
+    pq: IndexedPriorityQueue = IndexedPriorityQueue(wg.vertex_count)
+    visited: List[bool] = [False] * wg.vertex_count  # where we've been
+    best_edges: List[Optional[WeightedEdge]] = [None] * wg.vertex_count  # cheapest known way in
+
+    def visit(index: int):
+        visited[index] = True  # mark as visited
+        for edge in wg.edges_for_index(index):
+            if visited[edge.v]:
+                continue
+            best: Optional[WeightedEdge] = best_edges[edge.v]
+            if best is None:
+                best_edges[edge.v] = edge
+                pq.push(edge.v, edge.weight)
+            elif edge.weight < best.weight:
+                best_edges[edge.v] = edge
+                pq.decrease_key(edge.v, edge.weight)
+
+    visit(start)  # the first vertex is where everything begins
+
+    while not pq.empty:  # keep going while there are vertices to connect
+        v, _ = pq.pop()
+        edge: Optional[WeightedEdge] = best_edges[v]
+        assert edge is not None  # anything in the queue has a best edge
+        # this is the current smallest, so add it to solution
+        result.append(edge)
+        visit(v)  # visit where this connects
+
+    return result
+
+
+# Kruskal's algorithm: take edges cheapest first, skipping any that would
+# close a cycle. Unlike mst() it doesn't need a start vertex, and on a
+# disconnected graph it returns a minimum spanning forest.
+def kruskal(wg: WeightedGraph[V]) -> WeightedPath:
+    result: WeightedPath = []  # holds the final minimum spanning forest
+    # every undirected edge is stored once in each direction; keep one copy
+    edges: List[WeightedEdge] = [edge for u in range(wg.vertex_count)
+                                 for edge in wg.edges_for_index(u) if edge.u < edge.v]
+    edges.sort(key=lambda edge: edge.weight)
+    components: UnionFind = UnionFind(wg.vertex_count)
+    for edge in edges:
+        if components.union(edge.u, edge.v):  # joins two trees, so no cycle
+            result.append(edge)
+            if len(result) == wg.vertex_count - 1:
+                break  # a spanning tree, nothing left to add
+    return result
+
+
+# (weight, lower index, higher index) of the cheapest edge leaving each component
+CheapestEdges = Dict[int, Tuple[float, int, int]]
+
+# The graph each worker process searches and the component label of each
+# of its vertices, set once by _set_snapshot() rather than sent along with
+# every round. With a pool the labels are shared memory that the parent
+# rewrites between rounds, so a round only sends out vertex ranges.
+_snapshot: Optional[WeightedCSRGraph] = None
+_labels: Optional[MutableSequence[int]] = None
+
+
+def _set_snapshot(snapshot: WeightedCSRGraph, labels: MutableSequence[int]) -> None:
+    global _snapshot, _labels
+    _snapshot = snapshot
+    _labels = labels
+
+
+# Find the cheapest edge leaving each component, looking only at the
+# edges of the vertices in [start, end). Ties are broken by the vertex
+# indices so that every worker ranks edges the same way.
+def _cheapest_edges(start: int, end: int) -> CheapestEdges:
+    assert _snapshot is not None and _labels is not None  # set up by _set_snapshot()
+    graph: WeightedCSRGraph = _snapshot
+    labels: MutableSequence[int] = _labels
+    cheapest: CheapestEdges = {}
+    for u in range(start, end):
+        component: int = labels[u]
+        for v, weight in zip(graph.neighbor_indices_for_index(u), graph.weights_for_index(u)):
+            if labels[v] == component:
+                continue  # inside the component, not leaving it
+            candidate: Tuple[float, int, int] = (weight, u, v) if u < v else (weight, v, u)
+            if component not in cheapest or candidate < cheapest[component]:
+                cheapest[component] = candidate
+    return cheapest
+
+
+# Boruvka's algorithm: every round, each component adds the cheapest edge
+# leaving it, so the number of components at least halves per round. The
+# cheapest-edge search is split by vertex range across a pool of processes
+# (processes=None uses one per CPU, processes=1 stays in this process),
+# which get the graph once and read each round's labels from shared memory.
+# Like kruskal(), returns a minimum spanning forest.
+def boruvka(wg: Union[WeightedGraph[V], WeightedCSRGraph[V]], processes: Optional[int] = None) -> WeightedPath:
+    snapshot: WeightedCSRGraph[V] = wg if isinstance(wg, WeightedCSRGraph) else WeightedCSRGraph(wg)
+    size: int = snapshot.vertex_count
+    result: WeightedPath = []  # holds the final minimum spanning forest
+    components: UnionFind = UnionFind(size)
+    pool: Optional[Pool] = None
+    chunks: int = 1  # how many vertex ranges to split each round into
+    labels: MutableSequence[int]
+    if processes == 1:
+        labels = array('i', [0]) * size
+        _set_snapshot(snapshot, labels)
+    else:
+        chunks = (processes or cpu_count()) * 4
+        labels = RawArray('i', size)
+        pool = Pool(processes, initializer=_set_snapshot, initargs=(snapshot, labels))
+    try:
+        bounds: List[Tuple[int, int]] = [(size * i // chunks, size * (i + 1) // chunks) for i in range(chunks)]
+        while True:
+            labels[:] = array('i', (components.find(v) for v in range(size)))
+            found: List[CheapestEdges]
+            if pool is None:
+                found = [_cheapest_edges(*bound) for bound in bounds]
+            else:
+                found = pool.starmap(_cheapest_edges, bounds)
+            # combine each worker's view into one cheapest edge per component
+            cheapest: CheapestEdges = {}
+            for partial in found:
+                for component, candidate in partial.items():
+                    if component not in cheapest or candidate < cheapest[component]:
+                        cheapest[component] = candidate
+            if not cheapest:
+                break  # no edges leave any component, so we're done
+            for weight, u, v in cheapest.values():
+                if components.union(u, v):  # two components may pick the same edge
+                    result.append(WeightedEdge(u, v, weight))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return result
+
+
 def print_weighted_path(wg: WeightedGraph, wp: WeightedPath) -> None:
     for edge in wp:
         print(f"{wg.vertex_at(edge.u)} {edge.weight}> {wg.vertex_at(edge.v)}")
@@ -93,4 +236,10 @@ if __name__ == "__main__":
     if result is None:
         print("No solution found!")
     else:
-        print_weighted_path(city_graph2, result)
\ No newline at end of file
+        print_weighted_path(city_graph2, result)
+    print("")  # blank line
+
+    # Kruskal's and Boruvka's algorithms should find trees of the same weight
+    print_weighted_path(city_graph2, kruskal(city_graph2))
+    print("")  # blank line
+    print_weighted_path(city_graph2, boruvka(city_graph2))
\ No newline at end of file
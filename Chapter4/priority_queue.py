@@ -13,7 +13,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import TypeVar, Generic, List
+from typing import TypeVar, Generic, List, Tuple
 from heapq import heappush, heappop
 
 
@@ -35,4 +35,96 @@ class PriorityQueue(Generic[T]):
         return heappop(self._container)  # out by priority
 
     def __repr__(self) -> str:
-        return repr(self._container)
\ No newline at end of file
+        return repr(self._container)
+
+    def __len__(self) -> int:
+        return len(self._container)
+
+
+# A binary heap over the integers 0..capacity - 1 (usually vertex indices),
+# each with a float priority. A position table records where every index sits
+# in the heap, so an index is only ever in the queue once and its priority
+# can be lowered in place with decrease_key() instead of pushing a duplicate.
+class IndexedPriorityQueue:
+    def __init__(self, capacity: int) -> None:
+        self._heap: List[int] = []
+        self._priorities: List[float] = [0.0] * capacity
+        self._positions: List[int] = [-1] * capacity  # -1 means not in the heap
+
+    @property
+    def empty(self) -> bool:
+        return not self._heap  # not is true for empty container
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, index: int) -> bool:
+        return self._positions[index] != -1
+
+    def priority(self, index: int) -> float:
+        return self._priorities[index]
+
+    def push(self, index: int, priority: float) -> None:
+        if index in self:
+            raise ValueError(f"{index} is already in the queue")
+        self._priorities[index] = priority
+        self._positions[index] = len(self._heap)
+        self._heap.append(index)
+        self._sift_up(len(self._heap) - 1)
+
+    def decrease_key(self, index: int, priority: float) -> None:
+        if index not in self:
+            raise ValueError(f"{index} is not in the queue")
+        if priority > self._priorities[index]:
+            raise ValueError(f"New priority {priority} is greater than current priority {self._priorities[index]}")
+        self._priorities[index] = priority
+        self._sift_up(self._positions[index])
+
+    # Out by priority, returning the index and its priority
+    def pop(self) -> Tuple[int, float]:
+        top: int = self._heap[0]
+        last: int = self._heap.pop()
+        self._positions[top] = -1
+        if self._heap:
+            self._heap[0] = last
+            self._positions[last] = 0
+            self._sift_down(0)
+        return top, self._priorities[top]
+
+    def _sift_up(self, position: int) -> None:
+        heap: List[int] = self._heap
+        priorities: List[float] = self._priorities
+        index: int = heap[position]
+        priority: float = priorities[index]
+        while position > 0:
+            parent: int = (position - 1) >> 1
+            if priorities[heap[parent]] <= priority:
+                break
+            heap[position] = heap[parent]  # move the parent down a level
+            self._positions[heap[position]] = position
+            position = parent
+        heap[position] = index
+        self._positions[index] = position
+
+    def _sift_down(self, position: int) -> None:
+        heap: List[int] = self._heap
+        priorities: List[float] = self._priorities
+        size: int = len(heap)
+        index: int = heap[position]
+        priority: float = priorities[index]
+        while True:
+            child: int = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and priorities[heap[child + 1]] < priorities[heap[child]]:
+                child += 1  # the smaller of the two children
+            if priorities[heap[child]] >= priority:
+                break
+            heap[position] = heap[child]  # move the child up a level
+            self._positions[heap[position]] = position
+            position = child
+        heap[position] = index
+        self._positions[index] = position
+
+    def __repr__(self) -> str:
+        return repr([(index, self._priorities[index]) for index in self._heap])
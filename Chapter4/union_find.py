@@ -0,0 +1,58 @@
+# union_find.py
+# From Classic Computer Science Problems in Python Chapter 4
+# Copyright 2018 David Kopec
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import List
+
+
+# Disjoint sets over the integers 0..size - 1, with path compression
+# and union by rank so that find() is very nearly constant time
+class UnionFind:
+    def __init__(self, size: int) -> None:
+        self._parents: List[int] = list(range(size))  # every item starts as its own set
+        self._ranks: List[int] = [0] * size  # upper bound on each tree's height
+        self._count: int = size
+
+    @property
+    def count(self) -> int:
+        return self._count  # Number of disjoint sets
+
+    # Find the representative of the set containing item
+    def find(self, item: int) -> int:
+        root: int = item
+        while self._parents[root] != root:
+            root = self._parents[root]
+        # point everything on the way up straight at the root
+        while self._parents[item] != root:
+            self._parents[item], item = root, self._parents[item]
+        return root
+
+    # Merge the sets containing first and second,
+    # returning False if they were already the same set
+    def union(self, first: int, second: int) -> bool:
+        first_root: int = self.find(first)
+        second_root: int = self.find(second)
+        if first_root == second_root:
+            return False
+        # hang the shorter tree under the taller one
+        if self._ranks[first_root] < self._ranks[second_root]:
+            first_root, second_root = second_root, first_root
+        self._parents[second_root] = first_root
+        if self._ranks[first_root] == self._ranks[second_root]:
+            self._ranks[first_root] += 1
+        self._count -= 1
+        return True
+
+    def connected(self, first: int, second: int) -> bool:
+        return self.find(first) == self.find(second)
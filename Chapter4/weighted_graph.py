@@ -13,7 +13,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import TypeVar, Generic, List, Tuple
+from typing import TypeVar, Generic, List, Tuple, Iterable
 from graph import Graph
 from weighted_edge import WeightedEdge
 
@@ -22,7 +22,7 @@ V = TypeVar('V') # type of the vertices in the graph
 
 class WeightedGraph(Generic[V], Graph[V]):
     def __init__(self, vertices: List[V] = []) -> None:
-        self._vertices: List[V] = vertices
+        super().__init__(vertices)
         self._edges: List[List[WeightedEdge]] = [[] for _ in vertices]
 
     def add_edge_by_indices(self, u: int, v: int, weight: float) -> None:
@@ -30,10 +30,16 @@ class WeightedGraph(Generic[V], Graph[V]):
         self.add_edge(edge) # call superclass version
 
     def add_edge_by_vertices(self, first: V, second: V, weight: float) -> None:
-        u: int = self._vertices.index(first)
-        v: int = self._vertices.index(second)
+        u: int = self.index_of(first)
+        v: int = self.index_of(second)
         self.add_edge_by_indices(u, v, weight)
 
+    # Build up the graph from (first, second, weight) triples in a single pass,
+    # adding any vertices that haven't been seen before
+    def add_edges_from(self, edges: Iterable[Tuple[V, V, float]]) -> None:
+        for first, second, weight in edges:
+            self.add_edge_by_indices(self._index_or_add(first), self._index_or_add(second), weight)
+
     def neighbors_for_index_with_weights(self, index: int) -> List[Tuple[V, float]]:
         distance_tuples: List[Tuple[V, float]] = []
         for edge in self.edges_for_index(index):
@@ -43,7 +49,8 @@ class WeightedGraph(Generic[V], Graph[V]):
     def __str__(self) -> str:
         desc: str = ""
         for i in range(self.vertex_count):
-            desc += f"{self.vertex_at(i)} -> {self.neighbors_for_index_with_weights(i)}\n"
+            if not self.is_removed(i):
+                desc += f"{self.vertex_at(i)} -> {self.neighbors_for_index_with_weights(i)}\n"
         return desc
 
 